@@ -1,11 +1,13 @@
 from typing import Annotated, Any
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends, HTTPException, status, Request
-from app.db.session import get_session
+from app.db.session import get_session, AsyncSessionLocal
+from app.db.routing import read_your_writes
 from fastapi.security import OAuth2PasswordBearer, HTTPAuthorizationCredentials, HTTPBearer
-from app.db.redis import token_in_blocklist
+from app.db.redis import token_in_blocklist, revocation_cache
 from app.auth.utils import decode_token
-from app.auth.services import UserService
+from app.auth import services as auth_services
+from app.auth.services import UserService, principal_cache
 from app.db.models import User
 from app.error.custom_exceptions import InvalidToken, AccountNotVerified, InsufficientPermission
 from app.config import Config
@@ -46,19 +48,56 @@ class RefreshTokenBearer(TokenBear):
             raise InvalidToken()
 
 
-async def get_current_user(
-    token_details: Annotated[dict, Depends(AccessTokenBearer())], session: SessionDep
-):
-    user_email = token_details.get("email")
-    user = await user_services.get_user(user_email, session)
+access_token_bearer = AccessTokenBearer()
+"""
+Important Note:
+- FastAPI caches a dependency per request only when the *same* callable is declared.
+- Every router must use this instance (or `AccessTokenDep`/`CurrentUserDep`), so the JWT decode,
+  the blocklist lookup and the user resolution run once per request.
+"""
+AccessTokenDep = Annotated[dict, Depends(access_token_bearer)]
+
+
+async def get_read_session(token_details: AccessTokenDep) -> AsyncSession:
+    """Session on the read replica, or on the primary while the user is pinned after a write"""
+    session_factory = await read_your_writes.sessionmaker_for(token_details.get("user_id"))
+    async with session_factory() as session:
+        yield session
+
+
+async def get_write_session(token_details: AccessTokenDep) -> AsyncSession:
+    """Session on the primary; once the route succeeded the user's reads are pinned to the primary"""
+    async with AsyncSessionLocal() as session:
+        yield session
+    await read_your_writes.pin(token_details.get("user_id"))
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
+WriteSessionDep = Annotated[AsyncSession, Depends(get_write_session)]
+
+
+async def get_current_user(token_details: AccessTokenDep, session: SessionDep):
+    user_id = token_details.get("user_id")
+    # Without the invalidation subscription a role change on another worker could be missed
+    use_cache = bool(user_id) and revocation_cache.healthy
+    user = principal_cache.get(user_id) if use_cache else None
+    if user is None:
+        invalidations = auth_services.principal_invalidations
+        user_email = token_details.get("email")
+        user = await user_services.get_user(user_email, session)
+        if user is not None and use_cache and invalidations == auth_services.principal_invalidations:
+            principal_cache.set(user_id, User(**user.model_dump()))  # Detached copy without the password hash
     return user
 
 
+CurrentUserDep = Annotated[User, Depends(get_current_user)]
+
+
 class RoleChecker:
     def __init__(self, allowed_roles: list[str]) -> None:
         self.allowed_roles = allowed_roles
 
-    def __call__(self, current_user: Annotated[User, Depends(get_current_user)]) -> Any:
+    def __call__(self, current_user: CurrentUserDep) -> Any:
         if not current_user.is_verified:
             raise AccountNotVerified()
         if current_user.role in self.allowed_roles:
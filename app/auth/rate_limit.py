@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import math
+import time
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from app.config import Config
+from app.db.redis import CircuitBreaker, token_blocklist as redis_client
+from app.error.custom_exceptions import RateLimitExceeded
+
+TOKEN_BUCKET_SCRIPT = redis_client.register_script("""
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local now_ms = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now_ms
+tokens = math.min(capacity, tokens + math.max(0, now_ms - ts) * refill_per_ms)
+local retry_after_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after_ms = math.ceil((1 - tokens) / refill_per_ms)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now_ms)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms))
+return retry_after_ms
+""")
+
+
+class LocalTokenBuckets:
+    """In-process token buckets, used while Redis is unavailable (limits then apply per worker)"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str, capacity: int, refill_per_ms: float, now_ms: int) -> int:
+        tokens, ts = self._buckets.get(key, (capacity, now_ms))
+        tokens = min(capacity, tokens + max(0, now_ms - ts) * refill_per_ms)
+        retry_after_ms = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after_ms = math.ceil((1 - tokens) / refill_per_ms)
+        if len(self._buckets) >= self.max_keys and key not in self._buckets:
+            self._buckets.clear()
+        self._buckets[key] = (tokens, now_ms)
+        return retry_after_ms
+
+
+local_buckets = LocalTokenBuckets()
+rate_limit_breaker = CircuitBreaker(
+    failure_threshold=Config.RATE_LIMIT_BREAKER_THRESHOLD,
+    reset_timeout=Config.RATE_LIMIT_BREAKER_RESET_SECONDS,
+)
+
+
+class RateLimiter:
+    """
+    Token bucket of `limit` requests per `period` seconds, shared by all workers through a Redis Lua script.
+
+    Use the instance as a dependency to limit per client IP, and call `check()` with any other
+    identity (e.g. the username) once the request body is parsed.
+    Exceeding the limit raises RateLimitExceeded (429 with Retry-After).
+    When Redis errors, is slower than RATE_LIMIT_REDIS_TIMEOUT_MS or the breaker is open,
+    the in-process `local_buckets` are used instead.
+    """
+
+    def __init__(self, scope: str, limit: int, period: int = 60):
+        self.scope = scope
+        self.limit = limit
+        self.refill_per_ms = limit / (period * 1000)
+
+    async def __call__(self, request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        await self.check(f"ip:{client_ip}")
+
+    async def check(self, identity: str) -> None:
+        key = f"ratelimit:{self.scope}:{identity}"
+        now_ms = int(time.time() * 1000)
+        retry_after_ms = await self._take_shared(key, now_ms)
+        if retry_after_ms is None:
+            retry_after_ms = local_buckets.take(key, self.limit, self.refill_per_ms, now_ms)
+        if retry_after_ms > 0:
+            raise RateLimitExceeded(retry_after=math.ceil(retry_after_ms / 1000))
+
+    async def _take_shared(self, key: str, now_ms: int) -> int | None:
+        """Take a token from the Redis bucket, None when Redis cannot answer in time"""
+        if not rate_limit_breaker.allow():
+            return None
+        try:
+            retry_after_ms = await asyncio.wait_for(
+                TOKEN_BUCKET_SCRIPT(keys=[key], args=[self.limit, self.refill_per_ms, now_ms]),
+                timeout=Config.RATE_LIMIT_REDIS_TIMEOUT_MS / 1000,
+            )
+        except (RedisError, asyncio.TimeoutError) as e:
+            rate_limit_breaker.record_failure()
+            logging.warning(f"Rate limiter using in-process buckets, Redis unavailable: {e!r}")
+            return None
+        rate_limit_breaker.record_success()
+        return retry_after_ms
@@ -10,13 +10,14 @@ from app.auth.schemas import (
 from app.auth.dependencies import (
     SessionDep,
     RefreshTokenBearer,
-    AccessTokenBearer,
-    get_current_user,
+    AccessTokenDep,
+    CurrentUserDep,
     RoleChecker,
 )
 
+from app.auth.rate_limit import RateLimiter
 from app.celery_tasks import send_email
-from app.auth.services import UserService, AdminService
+from app.auth.services import UserService, AdminService, principal_cache
 from app.auth.utils import (
     encode_url_safe_token,
     decode_url_safe_token,
@@ -25,6 +26,7 @@ from app.auth.utils import (
 )
 from app.config import Config
 from app.db.redis import add_sub_to_blocklist
+from app.db.session import get_pool_stats
 from app.error.custom_exceptions import EmailAlreadyExists, UsernameAlreadyExists, UserNotFound, InvalidCredentials, \
     InvalidToken
 
@@ -36,17 +38,26 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent
 env = Environment(loader=FileSystemLoader(BASE_DIR.parent.parent / "templates"))
 
-access_token_bearer = AccessTokenBearer()
 role_checker = RoleChecker(["user", "admin"])
 admin_role_checker = Depends(RoleChecker(["admin"]))
 user_services = UserService()
 admin_services = AdminService()
+login_limiter = RateLimiter("login", Config.RATE_LIMIT_LOGIN_PER_MINUTE)
+signup_limiter = RateLimiter("signup", Config.RATE_LIMIT_SIGNUP_PER_MINUTE)
+forgot_password_limiter = RateLimiter(
+    "forgot_password", Config.RATE_LIMIT_FORGOT_PASSWORD_PER_MINUTE
+)
 
 oauth_route = APIRouter()
 
 
-@oauth_route.post("/signup", status_code=status.HTTP_201_CREATED)
+@oauth_route.post(
+    "/signup",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(signup_limiter)],
+)
 async def create_user(user_data: CreateUser, session: SessionDep):
+    await signup_limiter.check(f"user:{user_data.username}")
     email = user_data.email
     email_exists = await user_services.user_exists(email, session)
     if email_exists == "email_exists":
@@ -89,10 +100,11 @@ async def verify_user_account(token: str, session: SessionDep):
     )
 
 
-@oauth_route.post("/token")
+@oauth_route.post("/token", dependencies=[Depends(login_limiter)])
 async def user_login(
     user_data: Annotated[OAuth2PasswordRequestForm, Depends()], session: SessionDep
 ) -> Token:
+    await login_limiter.check(f"user:{user_data.username}")
     user = await user_services.authenticate_user(
         user_data.username, user_data.password, session
     )
@@ -118,14 +130,14 @@ async def user_login(
 
 @oauth_route.get("/me")
 async def get_current_user(
-    user=Depends(get_current_user),
+    user: CurrentUserDep,
     _: bool = Depends(role_checker),
 ):
     return user
 
 
 @oauth_route.get("/logout")
-async def revoke_token(token_details: Annotated[dict, Depends(access_token_bearer)]):
+async def revoke_token(token_details: AccessTokenDep):
     sub = token_details.get("sub")
     await add_sub_to_blocklist(sub)
     return JSONResponse(
@@ -149,9 +161,10 @@ async def get_new_access_token(
     raise InvalidToken()
 
 
-@oauth_route.post("/forgot-password")
+@oauth_route.post("/forgot-password", dependencies=[Depends(forgot_password_limiter)])
 async def password_reset_request(email_data: ForgotPasswordModel, session: SessionDep):
     email = email_data.email
+    await forgot_password_limiter.check(f"user:{email}")
     user = await user_services.get_user(email, session)
     if user is None:
         raise UserNotFound()
@@ -186,7 +199,7 @@ async def valid_reset_password(
         user = await user_services.get_user(user_email, session)
         if user is None:
             raise UserNotFound()
-        hashed_password = get_hashed_password(new_password)
+        hashed_password = await get_hashed_password(new_password)
         await user_services.update_user(
             user, {"hashed_password": hashed_password}, session
         )
@@ -206,7 +219,7 @@ async def valid_reset_password(
 async def upgrade_user(
     username_or_email: str,
     session: SessionDep,
-    _: Annotated[dict, Depends(access_token_bearer)],
+    _: AccessTokenDep,
 ):
     """Upgrade the user's role to admin"""
     user = await admin_services.get_user(username_or_email, session)
@@ -225,7 +238,7 @@ async def upgrade_user(
 )
 async def delete_user(
     username_or_email: str,
-    _: Annotated[dict, Depends(access_token_bearer)],
+    _: AccessTokenDep,
     session: SessionDep,
 ):
     """Just use for testing environment"""
@@ -234,4 +247,16 @@ async def delete_user(
     )
     if user_to_delete is None:
         raise UserNotFound()
-    return {"message": "User is deleted", "user": user_to_delete}
+    return {"message": "User is deleted", "user": username_or_email}
+
+
+@oauth_route.get("/principal_cache_stats", dependencies=[admin_role_checker])
+async def get_principal_cache_stats():
+    """Hit/miss counters of the principal cache used by get_current_user"""
+    return principal_cache.stats()
+
+
+@oauth_route.get("/db_pool_stats", dependencies=[admin_role_checker])
+async def get_db_pool_stats():
+    """Connection pool usage and checkout wait times, to size workers against the database"""
+    return get_pool_stats()
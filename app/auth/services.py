@@ -1,8 +1,56 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, or_, text
-from app.db.models import User
+from sqlmodel import select, update, delete, or_, text
+from sqlalchemy.exc import IntegrityError
+from redis.exceptions import RedisError
+from app.db.models import User, Product, Category
+from app.error.error_handler import DataBaseErrorHandler
 from app.auth.schemas import CreateUser, AdminCreateModel
 from app.auth.utils import get_hashed_password, verify_password
+from app.db.cache import LRUTTLCache
+from app.db.redis import token_blocklist as redis_client, revocation_cache, PRINCIPAL_CHANNEL
+from app.config import Config
+
+ADMIN_BOOTSTRAP_MARKER = f"bootstrap:admin:{Config.USERNAME_AD}"
+ADMIN_BOOTSTRAP_LOCK = f"{ADMIN_BOOTSTRAP_MARKER}:lock"
+ADMIN_BOOTSTRAP_LOCK_TTL = 60
+ADMIN_BOOTSTRAP_MARKER_TTL = 24 * 3600  # A database reset is noticed by the first boot after this
+
+principal_cache = LRUTTLCache(
+    maxsize=Config.PRINCIPAL_CACHE_SIZE, ttl=Config.PRINCIPAL_CACHE_TTL_SECONDS
+)  # Keyed by the JWT "user_id" claim
+
+principal_invalidations = 0  # Bumped on every invalidation, lets a loader detect it raced with one
+
+
+def apply_principal_invalidation(user_id: str) -> None:
+    global principal_invalidations
+    principal_invalidations += 1
+    if user_id == "*":
+        principal_cache.clear()
+    else:
+        principal_cache.invalidate(user_id)
+
+
+revocation_cache.subscribe(PRINCIPAL_CHANNEL, apply_principal_invalidation)
+
+
+async def invalidate_principal(user_id: str) -> None:
+    """
+    Drop a user ("*" for everyone) from the principal cache of every worker.
+
+    Important Note:
+    - Workers whose subscription is down do not use the principal cache at all (see get_current_user),
+      so a lost publish cannot leave stale roles authorizing requests.
+    """
+    apply_principal_invalidation(user_id)
+    try:
+        await redis_client.publish(PRINCIPAL_CHANNEL, user_id)
+    except RedisError as e:
+        logging.error(f"Could not publish principal invalidation for {user_id}: {str(e)}")
 
 
 class UserService:
@@ -23,7 +71,7 @@ class UserService:
 
 
     async def create_user(self, user_data: CreateUser, session: AsyncSession):
-        hashed_password = get_hashed_password(user_data.password)
+        hashed_password = await get_hashed_password(user_data.password)
         user_dict = user_data.model_dump(exclude="password")
         new_user = User(**user_dict, hashed_password=hashed_password)
         new_user.role = "user"
@@ -37,7 +85,7 @@ class UserService:
         user = await self.get_user(login_input, session)
         if not user:
             return False
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password(password, user.hashed_password):
             return False
         return user
 
@@ -46,30 +94,109 @@ class UserService:
             setattr(user, k, v)
         session.add(user)
         await session.commit()
+        await invalidate_principal(str(user.id))
         return user
 
 class AdminService(UserService):
     async def create_admin(self, admin_data: AdminCreateModel, session: AsyncSession):
-        get_admin_email = await self.get_user(admin_data.email, session)
-        if get_admin_email is not None:
-            return "Root admin already exists. Skipping creation."
-        get_admin_username = await self.get_user(admin_data.username, session)
-        if get_admin_username is not None:
+        statement = select(User.id).where(
+            or_(User.email == admin_data.email, User.username == admin_data.username)
+        )
+        if (await session.exec(statement)).first() is not None:
             return "Root admin already exists. Skipping creation."
-        hashed_password = get_hashed_password(admin_data.password)
+        hashed_password = await get_hashed_password(admin_data.password)
         admin_data_dict = admin_data.model_dump(exclude={"password"})
         new_admin = User(**admin_data_dict, hashed_password=hashed_password)
         session.add(new_admin)
         await session.commit()
 
+    async def bootstrap_admin(self, admin_data: AdminCreateModel, session: AsyncSession):
+        """
+        Create the root admin once per deployment instead of on every worker boot.
 
-    async def delete_user_account(self, user: str, session: AsyncSession):
-        user_to_delete = await self.get_user(user, session)
+        Important Note:
+        - Once the admin exists a Redis marker is set, later boots only read the marker.
+          It expires after `ADMIN_BOOTSTRAP_MARKER_TTL` and is cleared when the admin is deleted,
+          so a removed admin or a reset database gets the admin back on a later boot.
+        - A short-lived lock makes concurrently starting workers skip while one of them bootstraps.
+        - Without Redis it falls back to `create_admin`, a single indexed lookup.
+        """
+        try:
+            if await redis_client.exists(ADMIN_BOOTSTRAP_MARKER):
+                return "Root admin already bootstrapped. Skipping creation."
+            if not await redis_client.set(ADMIN_BOOTSTRAP_LOCK, "1", nx=True, ex=ADMIN_BOOTSTRAP_LOCK_TTL):
+                return "Root admin bootstrap running in another worker. Skipping creation."
+        except RedisError:
+            return await self.create_admin(admin_data, session)
+        try:
+            result = await self.create_admin(admin_data, session)
+            try:
+                await redis_client.set(ADMIN_BOOTSTRAP_MARKER, "1", ex=ADMIN_BOOTSTRAP_MARKER_TTL)
+            except RedisError as e:
+                logging.warning(f"Root admin bootstrap marker not set: {str(e)}")
+            return result
+        finally:
+            try:
+                await redis_client.delete(ADMIN_BOOTSTRAP_LOCK)
+            except RedisError as e:
+                logging.warning(f"Root admin bootstrap lock not released, expires in {ADMIN_BOOTSTRAP_LOCK_TTL}s: {str(e)}")
 
-        if user_to_delete is not None:
-            await session.delete(user_to_delete)
+    async def delete_user_account(self, user: str, session: AsyncSession):
+        user_ids = select(User.id).where(or_(User.email == user, User.username == user))
+        try:
+            # Products and categories created by the user are kept and detached from it
+            await session.exec(update(Product).where(Product.user_id.in_(user_ids)).values(user_id=None))
+            await session.exec(update(Category).where(Category.user_id.in_(user_ids)).values(user_id=None))
+            result = await session.exec(delete(User).where(or_(User.email == user, User.username == user)))
+            if result.rowcount == 0:
+                await session.rollback()
+                return None
             await session.commit()
+        except IntegrityError as e:
+            await DataBaseErrorHandler.handler_integrity_error(e, session, "user")
+        await invalidate_principal("*")  # The deleted id is not known without loading the row
+        if user in (Config.USERNAME_AD, Config.EMAIL_AD):
+            try:
+                await redis_client.delete(ADMIN_BOOTSTRAP_MARKER)  # Recreated on the next boot
+            except RedisError as e:
+                logging.warning(f"Root admin bootstrap marker not cleared: {str(e)}")
+        return True
 
-            return user_to_delete
-        else:
-            return None
+    async def delete_unverified_users(
+        self, older_than: timedelta, chunk_size: int, max_chunks: int, session: AsyncSession
+    ) -> dict:
+        """
+        Delete users still unverified after `older_than`, `chunk_size` rows per transaction.
+
+        Important Note:
+        - Each chunk is picked through the (is_verified, created_at) index and committed on its own,
+          so locks stay short and a busy run can be resumed by the next one.
+        - A run stops after `max_chunks` chunks, anything left is picked up on the next schedule.
+        """
+        cutoff = datetime.now(timezone.utc) - older_than
+        deleted = chunks = 0
+        start = time.perf_counter()
+        while chunks < max_chunks:
+            ids = (
+                await session.exec(
+                    select(User.id)
+                    .where(User.is_verified == False, User.created_at < cutoff)
+                    .order_by(User.created_at)
+                    .limit(chunk_size)
+                )
+            ).all()
+            if not ids:
+                break
+            await session.exec(update(Product).where(Product.user_id.in_(ids)).values(user_id=None))
+            await session.exec(update(Category).where(Category.user_id.in_(ids)).values(user_id=None))
+            result = await session.exec(
+                delete(User).where(User.id.in_(ids), User.is_verified == False)
+            )
+            await session.commit()
+            deleted += result.rowcount
+            chunks += 1
+            if len(ids) < chunk_size:
+                break
+        if deleted:
+            await invalidate_principal("*")
+        return {"deleted": deleted, "chunks": chunks, "seconds": round(time.perf_counter() - start, 3)}
@@ -1,24 +1,64 @@
+import asyncio
 import logging
+import threading
 import uuid
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from jwt.exceptions import InvalidTokenError
 from datetime import datetime, timezone, timedelta
 
 from passlib.context import CryptContext
 from itsdangerous import URLSafeTimedSerializer
 from app.config import Config
+from app.error.custom_exceptions import PasswordHashingBusy
 from fastapi import HTTPException, status
 
 
 pwd_context = CryptContext(schemes="bcrypt", deprecated="auto")
 
+"""
+Important Note:
+- bcrypt takes ~100-300 ms of CPU per call and would block the event loop if run inline.
+- Calls run on a bounded thread pool (bcrypt releases the GIL while hashing).
+- Once PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE calls are pending, new calls fail fast
+  with `PasswordHashingBusy` (503) instead of queueing without limit.
+- A call stays pending until its job is done on the executor: a request cancelled meanwhile
+  (client disconnect) does not stop a running job, so it must not free the slot either.
+"""
+hash_executor = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+pending_hash_jobs = 0
+pending_hash_jobs_lock = threading.Lock()  # Released from the executor threads
+
+
+def release_hash_job(future) -> None:
+    global pending_hash_jobs
+    with pending_hash_jobs_lock:
+        pending_hash_jobs -= 1
+
+
+async def run_in_hash_executor(fn, *args):
+    global pending_hash_jobs
+    with pending_hash_jobs_lock:
+        if pending_hash_jobs >= Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_MAX_QUEUE:
+            raise PasswordHashingBusy()
+        pending_hash_jobs += 1
+    try:
+        future = hash_executor.submit(fn, *args)
+    except Exception:
+        release_hash_job(None)
+        raise
+    future.add_done_callback(release_hash_job)  # Also runs when a queued job is cancelled
+    return await asyncio.wrap_future(future)
+
 
-def get_hashed_password(password):
-    return pwd_context.hash(password)
+async def get_hashed_password(password):
+    return await run_in_hash_executor(pwd_context.hash, password)
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await run_in_hash_executor(pwd_context.verify, plain_password, hashed_password)
 
 
 serializer = URLSafeTimedSerializer(
@@ -1,4 +1,60 @@
-from fastapi import APIRouter
+import uuid
 
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
 
-cart_routes
\ No newline at end of file
+from app.auth.dependencies import RoleChecker, AccessTokenDep, SessionDep
+from app.cart.schemas import CreateCartModel, UpdateCartModel, CartModel
+from app.cart.services import CartServices
+from app.error.custom_exceptions import ProductNotFound, CartItemNotFound
+from app.product.services import ProductServices
+
+role_checker = Depends(RoleChecker(["admin", "user"]))
+cart_services = CartServices()
+product_services = ProductServices()
+
+cart_route = APIRouter()
+
+
+@cart_route.get("/", response_model=CartModel, dependencies=[role_checker])
+async def get_cart(token_data: AccessTokenDep):
+    user_id = token_data.get("user_id")
+    cart = await cart_services.get_cart(user_id)
+    return cart
+
+
+@cart_route.post("/", dependencies=[role_checker])
+async def add_to_cart(
+    cart_data: CreateCartModel, token_data: AccessTokenDep, session: SessionDep
+):
+    user_id = token_data.get("user_id")
+    product = await product_services.get_product_item(str(cart_data.product_id), session)
+    if product is None:
+        raise ProductNotFound()
+    quantity = await cart_services.add_item(
+        user_id, cart_data.product_id, cart_data.quantity, product.price
+    )
+    return {"product_id": cart_data.product_id, "quantity": quantity}
+
+
+@cart_route.put("/{product_id}", dependencies=[role_checker])
+async def set_cart_quantity(
+    product_id: uuid.UUID, cart_data: UpdateCartModel, token_data: AccessTokenDep
+):
+    user_id = token_data.get("user_id")
+    updated = await cart_services.set_quantity(user_id, product_id, cart_data.quantity)
+    if not updated:
+        raise CartItemNotFound()
+    return {"product_id": product_id, "quantity": cart_data.quantity}
+
+
+@cart_route.delete("/{product_id}", dependencies=[role_checker])
+async def remove_from_cart(product_id: uuid.UUID, token_data: AccessTokenDep):
+    user_id = token_data.get("user_id")
+    removed = await cart_services.remove_item(user_id, product_id)
+    if not removed:
+        raise CartItemNotFound()
+    return JSONResponse(
+        content={"message": "Product is removed from cart"},
+        status_code=status.HTTP_200_OK,
+    )
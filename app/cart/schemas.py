@@ -2,6 +2,19 @@ import uuid
 from decimal import Decimal
 from pydantic import BaseModel, Field
 
+MAX_QUANTITY = 999  # Per product in a cart, OrderItem.quantity has the same bound
+
 class CreateCartModel(BaseModel):
     product_id: uuid.UUID
+    quantity: int = Field(default=1, ge=1, le=MAX_QUANTITY)
+
+class UpdateCartModel(BaseModel):
+    quantity: int = Field(ge=1, le=MAX_QUANTITY)
+
+class CartItemModel(BaseModel):
+    product_id: uuid.UUID
+    quantity: int
     price_at_purchase: Decimal = Field(default=0, max_digits=12, decimal_places=2)
+
+class CartModel(BaseModel):
+    items: list[CartItemModel] = []
@@ -0,0 +1,233 @@
+import logging
+import uuid
+from decimal import Decimal
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.cart.schemas import MAX_QUANTITY, CartItemModel, CartModel
+from app.config import Config
+from app.db.models import Cart, Order
+from app.db.session import AsyncSessionLocal
+from app.error.custom_exceptions import CartQuantityExceeded, CheckoutInProgress
+from app.db.redis import token_blocklist as redis_client
+
+"""
+Important Note:
+- Redis is the hot store: `cart:{user_id}` maps product_id -> quantity and
+  `cart:{user_id}:prices` maps product_id -> price snapshot.
+- Every mutation is one Lua script call (one round trip, atomic) that also marks the user
+  in `cart:dirty`.
+- The `Cart` table is written behind by the `flush_dirty_carts` Celery beat task, so the
+  request path never touches MySQL rows.
+"""
+CART_DIRTY_KEY = "cart:dirty"
+CART_FAILED_KEY = "cart:failed"  # Carts the Cart table rejects (e.g. a deleted product), parked for inspection
+
+# Returns the new quantity, or -1 without touching the cart when it would exceed ARGV[5]
+ADD_ITEM_SCRIPT = redis_client.register_script("""
+local quantity = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or 0) + tonumber(ARGV[2])
+if quantity > tonumber(ARGV[5]) then
+    return -1
+end
+redis.call('HSET', KEYS[1], ARGV[1], quantity)
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[4])
+return quantity
+""")
+
+SET_QUANTITY_SCRIPT = redis_client.register_script("""
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('SADD', KEYS[3], ARGV[3])
+return 1
+""")
+
+REMOVE_ITEM_SCRIPT = redis_client.register_script("""
+local removed = redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+if removed == 1 then
+    redis.call('SADD', KEYS[3], ARGV[2])
+end
+return removed
+""")
+
+# Moves the cart aside under cart:{uid}:checkout so items added during the checkout land in a new cart.
+# Returns 1 when taken, 0 for an empty cart, -1 while another checkout holds the lock,
+# -2 when a previous checkout left its cart behind (crash or Redis failure) and must be resolved first.
+TAKE_CART_SCRIPT = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    if redis.call('EXISTS', KEYS[6]) == 1 then
+        return -1
+    end
+    return -2
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RENAME', KEYS[1], KEYS[3])
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('RENAME', KEYS[2], KEYS[4])
+end
+redis.call('SET', KEYS[5], ARGV[1])
+redis.call('SET', KEYS[6], 1, 'EX', ARGV[2])
+return 1
+""")
+
+# Puts a taken cart back, adding to whatever the user put in the cart meanwhile (capped at ARGV[2])
+RESTORE_CART_SCRIPT = redis_client.register_script("""
+local items = redis.call('HGETALL', KEYS[3])
+for i = 1, #items, 2 do
+    local quantity = tonumber(redis.call('HGET', KEYS[1], items[i]) or 0) + tonumber(items[i + 1])
+    redis.call('HSET', KEYS[1], items[i], math.min(quantity, tonumber(ARGV[2])))
+end
+local prices = redis.call('HGETALL', KEYS[4])
+for i = 1, #prices, 2 do
+    redis.call('HSETNX', KEYS[2], prices[i], prices[i + 1])
+end
+redis.call('DEL', KEYS[3], KEYS[4], KEYS[5], KEYS[6])
+redis.call('SADD', KEYS[7], ARGV[1])
+return #items / 2
+""")
+
+CHECKOUT_LOCK_SECONDS = 60
+
+
+def cart_keys(user_id: str) -> list[str]:
+    return [f"cart:{user_id}", f"cart:{user_id}:prices", CART_DIRTY_KEY]
+
+
+def checkout_keys(user_id: str) -> list[str]:
+    return [
+        f"cart:{user_id}",
+        f"cart:{user_id}:prices",
+        f"cart:{user_id}:checkout",
+        f"cart:{user_id}:checkout:prices",
+        f"cart:{user_id}:checkout:order",
+        f"cart:{user_id}:checkout:lock",
+        CART_DIRTY_KEY,
+    ]
+
+
+async def order_exists(order_id: uuid.UUID) -> bool:
+    async with AsyncSessionLocal() as session:
+        return await session.get(Order, order_id) is not None
+
+
+class CartServices:
+    async def get_cart(self, user_id: str) -> CartModel:
+        return await self._read_cart(f"cart:{user_id}", f"cart:{user_id}:prices")
+
+    async def _read_cart(self, quantities_key: str, prices_key: str) -> CartModel:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            quantities, prices = await pipe.hgetall(quantities_key).hgetall(prices_key).execute()
+        items = [
+            CartItemModel(
+                product_id=uuid.UUID(product_id.decode()),
+                quantity=int(quantity),
+                price_at_purchase=Decimal(prices.get(product_id, b"0").decode()),
+            )
+            for product_id, quantity in quantities.items()
+        ]
+        return CartModel(items=items)
+
+    async def add_item(
+        self, user_id: str, product_id: uuid.UUID, quantity: int, price: Decimal
+    ) -> int:
+        """Add to the product's quantity, raises CartQuantityExceeded past MAX_QUANTITY"""
+        new_quantity = await ADD_ITEM_SCRIPT(
+            keys=cart_keys(user_id), args=[str(product_id), quantity, str(price), user_id, MAX_QUANTITY]
+        )
+        if new_quantity == -1:
+            raise CartQuantityExceeded()
+        return new_quantity
+
+    async def set_quantity(self, user_id: str, product_id: uuid.UUID, quantity: int) -> bool:
+        updated = await SET_QUANTITY_SCRIPT(
+            keys=cart_keys(user_id), args=[str(product_id), quantity, user_id]
+        )
+        return bool(updated)
+
+    async def remove_item(self, user_id: str, product_id: uuid.UUID) -> bool:
+        removed = await REMOVE_ITEM_SCRIPT(keys=cart_keys(user_id), args=[str(product_id), user_id])
+        return bool(removed)
+
+    async def take_cart_for_checkout(self, user_id: str, order_id: uuid.UUID) -> CartModel | None:
+        """
+        Atomically move the cart aside for a checkout creating `order_id`.
+        Returns None for an empty cart, raises CheckoutInProgress while another checkout runs.
+
+        A cart left behind by an earlier checkout is discarded if its order was committed,
+        and put back otherwise, before the current cart is taken.
+        """
+        keys = checkout_keys(user_id)
+        result = await TAKE_CART_SCRIPT(keys=keys[:6], args=[str(order_id), CHECKOUT_LOCK_SECONDS])
+        if result == -2:
+            leftover_order = await redis_client.get(keys[4])
+            if leftover_order is not None and await order_exists(uuid.UUID(leftover_order.decode())):
+                await self.finish_checkout(user_id)
+            else:
+                await self.restore_cart(user_id)
+            result = await TAKE_CART_SCRIPT(keys=keys[:6], args=[str(order_id), CHECKOUT_LOCK_SECONDS])
+        if result == -1 or result == -2:
+            raise CheckoutInProgress()
+        if result == 0:
+            return None
+        return await self._read_cart(keys[2], keys[3])
+
+    async def restore_cart(self, user_id: str) -> None:
+        """Give back a taken cart after a failed checkout"""
+        await RESTORE_CART_SCRIPT(keys=checkout_keys(user_id), args=[user_id, MAX_QUANTITY])
+
+    async def finish_checkout(self, user_id: str) -> None:
+        """Drop the taken cart once its order is committed"""
+        keys = checkout_keys(user_id)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.delete(*keys[2:6]).sadd(CART_DIRTY_KEY, user_id).execute()
+
+    async def flush_dirty_carts(self, session: AsyncSession) -> int:
+        """
+        Write the carts changed since the last run back to the Cart table.
+
+        Important Note:
+        - A cart rejected by a constraint is logged and parked in `cart:failed`, the rest of the batch goes on.
+          It is written again as soon as the user changes the cart (which marks it dirty again).
+        - Any other error (e.g. the database is down) puts every popped id not yet written back
+          in `cart:dirty` before raising, so the next run retries them.
+        """
+        flushed = 0
+        while True:
+            popped = await redis_client.spop(CART_DIRTY_KEY, Config.CART_FLUSH_BATCH_SIZE)
+            user_ids = [user_id.decode() for user_id in popped or []]
+            if not user_ids:
+                return flushed
+            for index, user_id in enumerate(user_ids):
+                try:
+                    await self._write_back(user_id, session)
+                    flushed += 1
+                except IntegrityError as e:
+                    await session.rollback()
+                    await redis_client.sadd(CART_FAILED_KEY, user_id)
+                    logging.error(f"Cart of user {user_id} rejected by the database, parked in {CART_FAILED_KEY}: {str(e)}")
+                except Exception:
+                    await session.rollback()
+                    await redis_client.sadd(CART_DIRTY_KEY, *user_ids[index:])  # Retry on the next run
+                    raise
+
+    async def _write_back(self, user_id: str, session: AsyncSession) -> None:
+        cart = await self.get_cart(user_id)
+        user_uuid = uuid.UUID(user_id)
+        await session.exec(delete(Cart).where(Cart.user_id == user_uuid))
+        session.add_all(
+            Cart(
+                user_id=user_uuid,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                price_at_purchase=item.price_at_purchase,
+            )
+            for item in cart.items
+        )
+        await session.commit()
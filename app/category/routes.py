@@ -1,26 +1,30 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Request, Response
 from fastapi.responses import JSONResponse
 
-from app.category.schemas import CategoryCreateModel
-from app.auth.dependencies import RoleChecker, AccessTokenBearer, SessionDep
+from app.category.schemas import CategoryCreateModel, CategoryUpdateModel
+from app.auth.dependencies import RoleChecker, AccessTokenDep, SessionDep, WriteSessionDep
 from app.category.services import CategoryServices
 from app.db.models import Category
+from app.db.etag import row_etag, collection_etag, etag_matches, not_modified
+from app.responses import FastJSONResponse
+from app.config import Config
+from pydantic import TypeAdapter
 from app.error.custom_exceptions import CategoryNotFound
 
-access_token_bearer = AccessTokenBearer()
 admin_role_checker = Depends(RoleChecker(["admin"]))
 role_checker = Depends(RoleChecker(["admin", "user"]))
 category_services = CategoryServices()
 
 category_route = APIRouter()
 
+category_list_adapter = TypeAdapter(list[Category])
+
 
 @category_route.post("/", response_model=Category, dependencies=[admin_role_checker])
 async def create_category(
     category_data: CategoryCreateModel,
-    token_data: Annotated[dict, Depends(access_token_bearer)],
-    session: SessionDep,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
 ) -> dict:
     user_id = token_data.get("user_id")
     new_category = await category_services.create_category(
@@ -29,11 +33,19 @@ async def create_category(
     return new_category
 
 
+# Category reads stay on the primary: they are served from category_cache, and a miss loaded
+# from a lagging replica would be cached under the new version until the TTL expires.
 @category_route.get("/", response_model=list[Category], dependencies=[role_checker])
 async def get_all_categories(
-    session: SessionDep, _: Annotated[dict, Depends(access_token_bearer)]
+    request: Request, response: Response, session: SessionDep, _: AccessTokenDep
 ):
     categories = await category_services.get_categories(session)
+    etag = collection_etag(categories)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if Config.FAST_JSON_RESPONSES:
+        return FastJSONResponse(categories, category_list_adapter, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return categories
 
 
@@ -42,12 +54,18 @@ async def get_all_categories(
 )
 async def get_category_item(
     category_id: str,
+    request: Request,
+    response: Response,
     session: SessionDep,
-    _: Annotated[dict, Depends(access_token_bearer)],
+    _: AccessTokenDep,
 ):
     category = await category_services.category_item(category_id, session)
     if category is None:
         raise CategoryNotFound()
+    etag = row_etag(category.id, category.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return category
 
 
@@ -57,8 +75,8 @@ async def get_category_item(
 async def update_category(
     category_id: str,
     category_data: CategoryCreateModel,
-    token_data: Annotated[dict, Depends(access_token_bearer)],
-    session: SessionDep,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
 ):
     user_id = token_data.get("user_id")
     updated_category = await category_services.update_category(
@@ -70,14 +88,34 @@ async def update_category(
         return updated_category
 
 
+@category_route.patch("/{category_id}", dependencies=[admin_role_checker])
+async def patch_category(
+    category_id: str,
+    category_data: CategoryUpdateModel,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
+):
+    """Partial update: only the fields in the body are written"""
+    user_id = token_data.get("user_id")
+    updated_fields = await category_services.patch_category(
+        category_id, category_data, user_id, session
+    )
+    if updated_fields is None:
+        raise CategoryNotFound()
+    return JSONResponse(
+        content={"message": "Category is updated", "updated_fields": updated_fields},
+        status_code=status.HTTP_200_OK,
+    )
+
+
 @category_route.delete(
     "/category-delete/{category_id}",
     dependencies=[admin_role_checker],
 )
 async def delete_category(
     category_id: str,
-    session: SessionDep,
-    _: Annotated[dict, Depends(access_token_bearer)],
+    session: WriteSessionDep,
+    _: AccessTokenDep,
 ):
     category_to_delete = await category_services.delete_category(category_id, session)
     if category_to_delete is None:
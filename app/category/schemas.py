@@ -1,4 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 class CategoryCreateModel(BaseModel):
     name: str = Field(max_length=64, min_length=1)
+
+class CategoryUpdateModel(BaseModel):
+    name: str | None = Field(default=None, max_length=64, min_length=1)
+
+    @model_validator(mode="after")
+    def reject_null_name(self):
+        if "name" in self.model_fields_set and self.name is None:
+            raise ValueError("name cannot be null")
+        return self
@@ -1,13 +1,21 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, desc
+from sqlmodel import select, update, delete, desc
 from sqlalchemy.exc import IntegrityError
-from app.db.models import Category
-from app.category.schemas import CategoryCreateModel
+from app.db.models import Category, Product
+from app.category.schemas import CategoryCreateModel, CategoryUpdateModel
 from app.error.error_handler import DataBaseErrorHandler
+from app.db.cache import VersionedCache
+from app.config import Config
 from fastapi import HTTPException
 
 import uuid
 
+category_cache = VersionedCache(
+    namespace="category",
+    ttl=Config.CATEGORY_CACHE_TTL_SECONDS,
+    local_ttl=Config.CATEGORY_LOCAL_CACHE_TTL_SECONDS,
+)
+
 
 class CategoryServices:
     async def create_category(self, category_data: CategoryCreateModel, user_id: str, session: AsyncSession):
@@ -17,26 +25,40 @@ class CategoryServices:
         try:
             session.add(new_category)
             await session.commit()
+            await category_cache.invalidate()
             return new_category
         except IntegrityError as e:
             await DataBaseErrorHandler.handler_integrity_error(e, session, "category")
 
 
-    async def category_item(self, category_id: str, session: AsyncSession):
+    async def _get_category_from_db(self, category_id: str, session: AsyncSession):
         statement = select(Category).where(Category.id == uuid.UUID(category_id))
         result = await session.exec(statement)
         category = result.first()
         return category
 
+    async def category_item(self, category_id: str, session: AsyncSession):
+        category_uuid = uuid.UUID(category_id)
+
+        async def load():
+            category = await self._get_category_from_db(category_id, session)
+            return category.model_dump(mode="json") if category is not None else None
+
+        category = await category_cache.get_or_load(f"item:{category_uuid}", load)
+        return Category.model_validate(category) if category is not None else None
+
     async def get_categories(self, session: AsyncSession):
-        statement = select(Category).order_by(desc(Category.name))
-        results = await session.exec(statement)
-        categories = results.all()
-        return categories
+        async def load():
+            statement = select(Category).order_by(desc(Category.name))
+            results = await session.exec(statement)
+            return [category.model_dump(mode="json") for category in results.all()]
+
+        categories = await category_cache.get_or_load("list", load)
+        return [Category.model_validate(category) for category in categories]
 
 
     async def update_category(self, category_id: str, update_data: CategoryCreateModel, user_id: str, session: AsyncSession):
-        category_to_update = await self.category_item(category_id, session)
+        category_to_update = await self._get_category_from_db(category_id, session)
 
         if category_to_update is not None:
             update_data_dict = update_data.model_dump()
@@ -47,19 +69,44 @@ class CategoryServices:
             category_to_update.user_id = uuid.UUID(user_id)
             try:
                 await session.commit()
+                await category_cache.invalidate()
                 return category_to_update
             except IntegrityError as e:
                await DataBaseErrorHandler.handler_integrity_error(e, session, "category")
         else:
             return None
 
-    async def delete_category(self, category_id: str, session: AsyncSession):
-        category_to_delete = await self.category_item(category_id, session)
-
-        if category_to_delete is not None:
-            await session.delete(category_to_delete)
+    async def patch_category(self, category_id: str, update_data: CategoryUpdateModel, user_id: str, session: AsyncSession):
+        """Write only the fields sent, in one UPDATE. Returns the updated field names, None if not found"""
+        update_data_dict = update_data.model_dump(exclude_unset=True)
+        statement = (
+            update(Category)
+            .where(Category.id == uuid.UUID(category_id))
+            .values(**update_data_dict, user_id=uuid.UUID(user_id))
+        )
+        try:
+            result = await session.exec(statement)
             await session.commit()
-
-            return category_to_delete
-        else:
+        except IntegrityError as e:
+            await DataBaseErrorHandler.handler_integrity_error(e, session, "category")
+        if result.rowcount == 0:
             return None
+        await category_cache.invalidate()
+        return list(update_data_dict)
+
+    async def delete_category(self, category_id: str, session: AsyncSession):
+        category_uuid = uuid.UUID(category_id)
+        try:
+            # Products of the category are kept and detached from it
+            await session.exec(
+                update(Product).where(Product.category_id == category_uuid).values(category_id=None)
+            )
+            result = await session.exec(delete(Category).where(Category.id == category_uuid))
+            if result.rowcount == 0:
+                await session.rollback()
+                return None
+            await session.commit()
+        except IntegrityError as e:
+            await DataBaseErrorHandler.handler_integrity_error(e, session, "category")
+        await category_cache.invalidate()
+        return True
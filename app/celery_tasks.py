@@ -1,15 +1,112 @@
-from app.mail import create_message, mail
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+
+from app.mail import create_message, smtp_pool
+from app.auth.services import AdminService
+from app.cart.services import CartServices
+from app.config import Config
+from app.db.session import AsyncSessionLocal
 from celery import Celery
-from asgiref.sync import async_to_sync
+from celery.signals import worker_process_shutdown
 
 c_app = Celery()
 c_app.config_from_object("app.config")
 
+cart_services = CartServices()
+admin_services = AdminService()
+
+# One event loop per worker process, kept for its whole life so the SMTP session,
+# the DB pool and the Redis pool can be reused across tasks instead of rebuilt per task.
+# Created lazily in the process that runs tasks: a loop made before the prefork pool forks
+# (or in the web process, which imports this module) would share its epoll/self-pipe with the children.
+worker_loop: asyncio.AbstractEventLoop | None = None
+worker_loop_pid: int | None = None
+
+
+def run_async(coro):
+    global worker_loop, worker_loop_pid
+    if worker_loop is None or worker_loop_pid != os.getpid():
+        worker_loop = asyncio.new_event_loop()
+        worker_loop_pid = os.getpid()
+    return worker_loop.run_until_complete(coro)
+
+
+@worker_process_shutdown.connect
+def close_worker_loop(**kwargs):
+    if worker_loop is not None and worker_loop_pid == os.getpid():
+        worker_loop.run_until_complete(smtp_pool.close())
+        worker_loop.close()
+
 
 @c_app.task()
 def send_email(recipients: list[str], subject: str, body: str):
 
     messages = create_message(recipients, subject, body)
 
-    async_to_sync(mail.send_message)(messages)
+    run_async(smtp_pool.send(messages))
     print("Email sent")
+
+
+async def _send_email_batch(emails: list[dict]) -> int:
+    failed = 0
+    for email in emails:
+        try:
+            await smtp_pool.send(
+                create_message(email["recipients"], email["subject"], email["body"])
+            )
+        except Exception as e:
+            failed += 1
+            logging.error(f"Failed to send email to {email['recipients']}: {str(e)}")
+    return failed
+
+
+@c_app.task()
+def send_email_batch(emails: list[dict]):
+    """
+    Send many emails over the worker's pooled SMTP session.
+
+    Each item is {"recipients": [...], "subject": "...", "body": "..."}.
+    A failing message is logged and skipped, the rest of the batch is still sent.
+    """
+    start = time.perf_counter()
+    failed = run_async(_send_email_batch(emails))
+    elapsed = time.perf_counter() - start
+    sent = len(emails) - failed
+    logging.info(
+        f"Email batch: {sent} sent, {failed} failed in {elapsed:.2f}s "
+        f"({sent / elapsed if elapsed else 0:.1f} msg/s), pool {smtp_pool.stats()}"
+    )
+    return {"sent": sent, "failed": failed, "seconds": round(elapsed, 3)}
+
+
+async def _flush_dirty_carts() -> int:
+    async with AsyncSessionLocal() as session:
+        return await cart_services.flush_dirty_carts(session)
+
+
+@c_app.task()
+def flush_dirty_carts():
+    flushed = run_async(_flush_dirty_carts())
+    print(f"Flushed {flushed} cart(s)")
+
+
+async def _delete_unverified_users() -> dict:
+    async with AsyncSessionLocal() as session:
+        return await admin_services.delete_unverified_users(
+            older_than=timedelta(minutes=Config.UNVERIFIED_USER_TTL_MINUTES),
+            chunk_size=Config.UNVERIFIED_CLEANUP_CHUNK_SIZE,
+            max_chunks=Config.UNVERIFIED_CLEANUP_MAX_CHUNKS,
+            session=session,
+        )
+
+
+@c_app.task()
+def delete_unverified_users():
+    report = run_async(_delete_unverified_users())
+    logging.info(
+        f"Deleted {report['deleted']} unverified user(s) in {report['chunks']} chunk(s), {report['seconds']}s"
+    )
+    return report
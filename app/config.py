@@ -1,11 +1,10 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Literal
 
 base_dir = Path(__file__).resolve().parent.parent
 env_path = base_dir/".env"
 
-print(env_path)
-
 class Settings(BaseSettings):
     DATABASE_URL: str
     JWT_SECRET: str
@@ -22,6 +21,47 @@ class Settings(BaseSettings):
     USERNAME_AD: str
     PASSWORD_AD: str
     VERSION: str
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    CATEGORY_CACHE_TTL_SECONDS: int = 3600
+    CATEGORY_LOCAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    EXPORT_YIELD_PER: int = 1000
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    CART_FLUSH_INTERVAL_SECONDS: int = 10
+    CART_FLUSH_BATCH_SIZE: int = 100
+    PRODUCT_BATCH_MAX_KEYS: int = 100
+    FAST_JSON_RESPONSES: bool = False
+    BULK_DELETE_CHUNK_SIZE: int = 500
+    BLOCKLIST_FAILURE_POLICY: Literal["open", "closed"] = "closed"
+    BLOCKLIST_REDIS_TIMEOUT_MS: int = 50
+    BLOCKLIST_BREAKER_THRESHOLD: int = 5
+    BLOCKLIST_BREAKER_RESET_SECONDS: int = 30
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_SIGNUP_PER_MINUTE: int = 5
+    RATE_LIMIT_FORGOT_PASSWORD_PER_MINUTE: int = 3
+    RATE_LIMIT_REDIS_TIMEOUT_MS: int = 50
+    RATE_LIMIT_BREAKER_THRESHOLD: int = 5
+    RATE_LIMIT_BREAKER_RESET_SECONDS: int = 30
+    MAIL_POOL_MAX_MESSAGES: int = 100
+    MAIL_POOL_IDLE_SECONDS: int = 60
+    UNVERIFIED_USER_TTL_MINUTES: int = 60
+    UNVERIFIED_CLEANUP_INTERVAL_SECONDS: int = 300
+    UNVERIFIED_CLEANUP_CHUNK_SIZE: int = 500
+    UNVERIFIED_CLEANUP_MAX_CHUNKS: int = 20
+    DB_POOL_WARM_CONNECTIONS: int = 5
+    SQL_PROFILER: bool = False
+    SQL_PROFILER_REPEAT_THRESHOLD: int = 3
+    READ_DATABASE_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: int = 5
 
     model_config = SettingsConfigDict(env_file=env_path, extra="ignore")
 
@@ -33,5 +73,15 @@ Config = Settings()
 broker_url = Config.REDIS_URL
 result_backend = Config.REDIS_URL
 broker_connection_retry_on_startup = True
+beat_schedule = {
+    "flush-dirty-carts": {
+        "task": "app.celery_tasks.flush_dirty_carts",
+        "schedule": Config.CART_FLUSH_INTERVAL_SECONDS,
+    },
+    "delete-unverified-users": {
+        "task": "app.celery_tasks.delete_unverified_users",
+        "schedule": Config.UNVERIFIED_CLEANUP_INTERVAL_SECONDS,
+    },
+}
 
     
\ No newline at end of file
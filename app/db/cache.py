@@ -0,0 +1,132 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from app.db.redis import token_blocklist as redis_client
+
+
+class VersionedCache:
+    """
+    Two-level cache (in-process TTL dict in front of Redis) for rarely changing data.
+
+    Important Note:
+    - Every key is scoped by a version counter kept in Redis.
+    - `invalidate()` bumps the version, so all workers stop reading the old entries at once.
+    - Values must be JSON serializable.
+    - If the version cannot be bumped (Redis down), the write is not failed: the bump is retried in the
+      background until it succeeds (or `ttl` has passed and old entries expired anyway), and this worker
+      reads from the database meanwhile.
+    """
+
+    def __init__(self, namespace: str, ttl: int, local_ttl: int, max_local_entries: int = 1024):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_local_entries = max_local_entries
+        self._local: dict[str, tuple[int, float, Any]] = {}
+        self._pending_invalidation: asyncio.Task | None = None
+
+    @property
+    def version_key(self) -> str:
+        return f"cache:{self.namespace}:version"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self._pending_invalidation is not None and not self._pending_invalidation.done():
+            return await loader()
+        try:
+            version = await redis_client.get(self.version_key)
+            version = int(version) if version is not None else 0
+
+            now = time.monotonic()
+            local_entry = self._local.get(key)
+            if local_entry is not None and local_entry[0] == version and local_entry[1] > now:
+                return local_entry[2]
+
+            redis_key = f"cache:{self.namespace}:v{version}:{key}"
+            raw = await redis_client.get(redis_key)
+            if raw is not None:
+                value = json.loads(raw)
+            else:
+                value = await loader()
+                if value is not None:
+                    await redis_client.set(redis_key, json.dumps(value), ex=self.ttl)
+        except RedisError as e:
+            logging.warning(f"Cache '{self.namespace}' unavailable, reading from database: {str(e)}")
+            return await loader()
+
+        if value is not None:
+            if len(self._local) >= self.max_local_entries:
+                self._local.clear()
+            self._local[key] = (version, now + self.local_ttl, value)
+        return value
+
+    async def invalidate(self) -> None:
+        self._local.clear()
+        try:
+            await redis_client.incr(self.version_key)
+        except RedisError as e:
+            logging.error(f"Cache '{self.namespace}' invalidation failed, retrying in background: {str(e)}")
+            if self._pending_invalidation is None or self._pending_invalidation.done():
+                self._pending_invalidation = asyncio.create_task(self._retry_invalidate())
+
+    async def _retry_invalidate(self) -> None:
+        deadline = time.monotonic() + self.ttl
+        delay = 0.5
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+            try:
+                await redis_client.incr(self.version_key)
+            except RedisError:
+                continue
+            self._local.clear()
+            logging.info(f"Cache '{self.namespace}' invalidated after Redis recovered")
+            return
+
+
+class LRUTTLCache:
+    """Bounded in-process cache: least recently used entries are evicted first, and entries expire after `ttl` seconds"""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,32 @@
+import hashlib
+from typing import Iterable
+
+from fastapi import Request, Response, status
+
+
+def row_etag(row_id, version: int) -> str:
+    return f'"{row_id}-{version}"'
+
+
+def collection_etag(rows: Iterable, *extra) -> str:
+    """Strong ETag over the (id, version) pairs of a result set, cheap to compute before serializing"""
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update(f"{row.id}:{row.version};".encode())
+    for part in extra:
+        digest.update(f"{part};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
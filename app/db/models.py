@@ -1,10 +1,31 @@
 import uuid
 from datetime import datetime, timezone, timedelta, date
 from decimal import Decimal
-from sqlmodel import SQLModel, Field, Column, Relationship, String, Numeric
+from sqlmodel import SQLModel, Field, Column, Relationship, String, Numeric, Index
+from sqlalchemy import literal_column
 from typing import Optional
 
+
+def version_field():
+    """
+    Row version, bumped by every UPDATE (ORM flush or Core `update()`) and used for ETags.
+
+    Important Note:
+    - INSERT ... ON DUPLICATE KEY UPDATE does not apply `onupdate`, bump it explicitly there.
+    - Models using it set `eager_defaults` so the new value is fetched during the flush,
+      instead of being lazy-loaded (which is not allowed with AsyncSession).
+    """
+    return Field(
+        default=1,
+        sa_column_kwargs={"server_default": "1", "onupdate": literal_column("version") + 1},
+    )
+
+
 class User(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_user_is_verified_created_at", "is_verified", "created_at"),  # Unverified cleanup
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     email: str = Field(default=None, index=True, unique=True)
     username: str = Field(default=None, index=True, unique=True)
@@ -25,9 +46,12 @@ class User(SQLModel, table=True):
     orders: list["Order"] = Relationship(back_populates="user")
 
 class Category(SQLModel, table=True):
+    __mapper_args__ = {"eager_defaults": True}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(..., nullable=False, unique=True)
     user_id: uuid.UUID | None = Field(default=None, foreign_key="user.id")
+    version: int = version_field()
 
     user: User | None = Relationship(back_populates="categories")
     products: list["Product"] = Relationship(back_populates="category")
@@ -36,12 +60,21 @@ class Category(SQLModel, table=True):
 class Cart(SQLModel, table=True):
     user_id: uuid.UUID | None = Field(default=None, foreign_key="user.id", primary_key=True)
     product_id: uuid.UUID | None = Field(default=None, foreign_key="product.id", primary_key=True)
+    quantity: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     price_at_purchase: Decimal = Field(default=0, max_digits=12, decimal_places=2)
 
     user: User | None = Relationship(back_populates="carts")
     product: Optional["Product"] = Relationship(back_populates="carts")
 
 class Product(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_product_created_at_id", "created_at", "id"),  # Keyset pagination
+        Index("ix_product_category_id_created_at_id", "category_id", "created_at", "id"),
+        Index("ix_product_price", "price"),
+        Index("ix_product_sku_description", "sku", "description", mysql_prefix="FULLTEXT"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     sku: str = Field(default=None, unique=True, nullable=False)
     description: str = Field(default=None, max_length=1024)
@@ -50,6 +83,7 @@ class Product(SQLModel, table=True):
     category_id: uuid.UUID | None = Field(default=None, foreign_key="category.id")
     created_at: date
     user_id: uuid.UUID | None = Field(default=None, foreign_key="user.id")
+    version: int = version_field()
 
     category: Category | None = Relationship(back_populates="products")
     user: User | None = Relationship(back_populates="products")
@@ -0,0 +1,128 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Config
+
+# Collapses expanded IN lists and VALUES rows so the same statement with different sizes has one shape
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,)+\s*(?:\?|%s|%\(\w+\)s)\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return WHITESPACE.sub(" ", PLACEHOLDER_LIST.sub("(?, ...)", statement)).strip()
+
+
+class QueryProfile:
+    """Statements executed while the profile is active, with their timings"""
+
+    def __init__(self, repeat_threshold: int = Config.SQL_PROFILER_REPEAT_THRESHOLD):
+        self.repeat_threshold = repeat_threshold
+        self.statements: list[tuple[str, float]] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements.append((statement, seconds))
+        self.shapes[statement_shape(statement)] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(seconds for _, seconds in self.statements) * 1000, 3)
+
+    def repeated(self) -> dict[str, int]:
+        """Statement shapes executed at least `repeat_threshold` times, the usual sign of an N+1"""
+        return {shape: n for shape, n in self.shapes.items() if n >= self.repeat_threshold}
+
+
+current_profile: ContextVar[QueryProfile | None] = ContextVar("current_profile", default=None)
+
+
+def record_statement(statement: str, seconds: float) -> None:
+    """Called by the engine events in app.db.session, a no-op unless a profile is active"""
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(statement, seconds)
+
+
+@contextmanager
+def profile_queries():
+    profile = QueryProfile()
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+
+
+class SQLProfilerMiddleware:
+    """
+    Debug middleware profiling the SQL of every request (enabled with SQL_PROFILER).
+
+    Important Note:
+    - Totals are returned in the X-SQL-Query-Count, X-SQL-Query-Time-Ms and X-SQL-Repeated headers,
+      statements issued after the response has started (streaming bodies) only reach the log line.
+    - One JSON log line per request, at WARNING level when a statement shape repeats.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-sql-query-count", str(profile.count).encode()))
+                headers.append((b"x-sql-query-time-ms", str(profile.total_ms).encode()))
+                headers.append((b"x-sql-repeated", str(len(profile.repeated())).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        with profile_queries() as profile:
+            start = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                repeated = profile.repeated()
+                logging.log(
+                    logging.WARNING if repeated else logging.INFO,
+                    json.dumps(
+                        {
+                            "event": "sql_profile",
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "queries": profile.count,
+                            "query_time_ms": profile.total_ms,
+                            "request_time_ms": round((time.perf_counter() - start) * 1000, 3),
+                            "repeated": [
+                                {"statement": shape, "count": n} for shape, n in repeated.items()
+                            ],
+                        }
+                    ),
+                )
+
+
+def assert_query_budget(response, max_queries: int, allow_repeated: bool = False) -> None:
+    """
+    Assert on the profiler headers of a response, for use in tests with SQL_PROFILER enabled
+    (the `profiled_client` fixture of tests/conftest.py):
+
+        response = await profiled_client.get("/products/")
+        assert_query_budget(response, max_queries=2)
+    """
+    count = int(response.headers["x-sql-query-count"])
+    repeated = int(response.headers["x-sql-repeated"])
+    assert count <= max_queries, f"{count} SQL statements, budget is {max_queries}"
+    assert allow_repeated or repeated == 0, f"{repeated} statement shape(s) repeated (N+1)"
@@ -1,15 +1,187 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
 import redis.asyncio as aioredis
+from redis.exceptions import RedisError
 
 from app.config import Config
+from app.metrics import redis_command_duration_seconds, redis_errors_total
 
 JTI_EXPIRY = 3600
+BLOCKLIST_PREFIX = "blocklist:"
+BLOCKLIST_CHANNEL = "blocklist:revoked"
+PRINCIPAL_CHANNEL = "principal:invalidated"
+
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client recording the round trip time of every command (pipelines are timed as PIPELINE)"""
+
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except RedisError:
+            redis_errors_total.inc(command)
+            raise
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - start, command)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class InstrumentedPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        except RedisError:
+            redis_errors_total.inc("PIPELINE")
+            raise
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - start, "PIPELINE")
+
+
+token_blocklist = InstrumentedRedis.from_url(Config.REDIS_URL)
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for `reset_timeout` seconds after `failure_threshold` failures in a row"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_started_at: float | None = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        # Half-open: a single call probes, the others keep failing fast until it records a result.
+        # A probe that never reports back (e.g. a cancelled request) is replaced after `reset_timeout`.
+        if self.probe_started_at is not None and now - self.probe_started_at < self.reset_timeout:
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probe_started_at = None
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RevocationCache:
+    """
+    In-process copy of the token blocklist.
+
+    Important Note:
+    - Warmed with a SCAN on startup, then kept in sync by the `blocklist:revoked` pub/sub channel.
+    - While the subscription is down the copy may be missing entries, so `healthy` is False and
+      lookups fall back to Redis.
+    - Other in-process caches can share the subscription through `subscribe()`.
+    """
+
+    def __init__(self):
+        self.healthy = False
+        self._revoked: dict[str, float] = {}
+        self._handlers: dict[str, Callable[[str], None]] = {}
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        """
+        Also dispatch the messages of `channel` to `handler`.
+        The handler gets "*" after every (re)subscription, since messages may have been missed meanwhile.
+        """
+        self._handlers[channel] = handler
+
+    def add(self, sub: str) -> None:
+        now = time.monotonic()
+        if len(self._revoked) >= 10000:
+            self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+        self._revoked[sub] = now + JTI_EXPIRY
+
+    def contains(self, sub: str) -> bool:
+        expires = self._revoked.get(sub)
+        return expires is not None and expires > time.monotonic()
+
+    async def warm(self) -> None:
+        async for key in token_blocklist.scan_iter(match=f"{BLOCKLIST_PREFIX}*", count=1000):
+            self.add(key.decode().removeprefix(BLOCKLIST_PREFIX))
+
+    async def listen(self) -> None:
+        while True:
+            pubsub = token_blocklist.pubsub()
+            try:
+                await pubsub.subscribe(BLOCKLIST_CHANNEL, *self._handlers)
+                await self.warm()  # After subscribing, so nothing published in between is missed
+                for handler in self._handlers.values():
+                    handler("*")
+                self.healthy = True
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    channel = message["channel"].decode()
+                    if channel == BLOCKLIST_CHANNEL:
+                        self.add(message["data"].decode())
+                    else:
+                        self._handlers[channel](message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Blocklist subscription lost, falling back to Redis lookups: {str(e)}")
+            finally:
+                self.healthy = False
+                await pubsub.aclose()
+            await asyncio.sleep(1)
+
+
+revocation_cache = RevocationCache()
+blocklist_breaker = CircuitBreaker(
+    failure_threshold=Config.BLOCKLIST_BREAKER_THRESHOLD,
+    reset_timeout=Config.BLOCKLIST_BREAKER_RESET_SECONDS,
+)
 
-token_blocklist = aioredis.from_url(Config.REDIS_URL)
 
 async def add_sub_to_blocklist(sub: str) -> None:
-    await token_blocklist.set(name=sub, value="", ex=JTI_EXPIRY)
+    revocation_cache.add(sub)
+    async with token_blocklist.pipeline(transaction=True) as pipe:
+        await (
+            pipe.set(name=f"{BLOCKLIST_PREFIX}{sub}", value="", ex=JTI_EXPIRY)
+            .publish(BLOCKLIST_CHANNEL, sub)
+            .execute()
+        )
+
 
 async def token_in_blocklist(sub: str) -> bool:
-    sub = await token_blocklist.get(sub)
-    return sub is not None
+    if revocation_cache.contains(sub):
+        return True
+    if revocation_cache.healthy:
+        return False
 
+    fail_closed = Config.BLOCKLIST_FAILURE_POLICY == "closed"
+    if not blocklist_breaker.allow():
+        return fail_closed
+    try:
+        value = await asyncio.wait_for(
+            token_blocklist.get(f"{BLOCKLIST_PREFIX}{sub}"),
+            timeout=Config.BLOCKLIST_REDIS_TIMEOUT_MS / 1000,
+        )
+    except (RedisError, asyncio.TimeoutError) as e:
+        blocklist_breaker.record_failure()
+        logging.warning(f"Blocklist lookup failed ({Config.BLOCKLIST_FAILURE_POLICY} policy): {e!r}")
+        return fail_closed
+    blocklist_breaker.record_success()
+    return value is not None
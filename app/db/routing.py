@@ -0,0 +1,57 @@
+import logging
+import time
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Config
+from app.db.redis import token_blocklist as redis_client
+from app.db.session import AsyncSessionLocal, ReadSessionLocal, has_read_replica
+
+PIN_PREFIX = "pin:primary:"
+
+
+class ReadYourWrites:
+    """
+    Sends a user's reads to the primary for `window_seconds` after they wrote, so the replica lag never
+    hides their own changes from them.
+
+    Important Note:
+    - The pin is kept in Redis so it holds across workers, with a local copy for the worker that served the write.
+    - When Redis cannot be reached reads go to the primary: stale reads are worse than extra primary load.
+    - Without a read replica every call is a no-op returning the primary.
+    """
+
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+        self._pinned_until: dict[str, float] = {}
+
+    async def pin(self, user_id: str | None) -> None:
+        if not has_read_replica or user_id is None:
+            return
+        self._pinned_until[user_id] = time.monotonic() + self.window_seconds
+        try:
+            await redis_client.set(f"{PIN_PREFIX}{user_id}", 1, ex=self.window_seconds)
+        except RedisError as e:
+            logging.warning(f"Could not pin user {user_id} to the primary: {str(e)}")
+
+    async def is_pinned(self, user_id: str | None) -> bool:
+        if user_id is None:
+            return False
+        pinned_until = self._pinned_until.get(user_id)
+        if pinned_until is not None:
+            if pinned_until > time.monotonic():
+                return True
+            del self._pinned_until[user_id]
+        try:
+            return bool(await redis_client.exists(f"{PIN_PREFIX}{user_id}"))
+        except RedisError:
+            return True
+
+    async def sessionmaker_for(self, user_id: str | None) -> sessionmaker:
+        if not has_read_replica or await self.is_pinned(user_id):
+            return AsyncSessionLocal
+        return ReadSessionLocal
+
+
+read_your_writes = ReadYourWrites(Config.READ_YOUR_WRITES_SECONDS)
@@ -1,18 +1,65 @@
+import asyncio
+import time
+
+from sqlalchemy import event
 from sqlmodel import SQLModel, text
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import Config
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.profiler import record_statement
+from app.metrics import db_queries_total, db_query_duration_seconds
 
 database_url = Config.DATABASE_URL
 
-engine = create_async_engine(url=database_url, future=True)
+
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    kind = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    db_queries_total.inc(kind)
+    db_query_duration_seconds.observe(elapsed, kind)
+    record_statement(statement, elapsed)
+
+
+def discard_query_timer(exception_context):
+    # after_cursor_execute is not called for a failed statement
+    if exception_context.connection is not None and exception_context.connection.info.get("query_start"):
+        exception_context.connection.info["query_start"].pop()
+
+
+def build_engine(url: str):
+    new_engine = create_async_engine(
+        url=url,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,  # MySQL drops idle connections after wait_timeout
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+    )
+    event.listen(new_engine.sync_engine, "before_cursor_execute", start_query_timer)
+    event.listen(new_engine.sync_engine, "after_cursor_execute", record_query)
+    event.listen(new_engine.sync_engine, "handle_error", discard_query_timer)
+    return new_engine
+
+
+engine = build_engine(database_url)
+# Replica for read-only routes, the primary itself when no READ_DATABASE_URL is configured
+read_engine = build_engine(Config.READ_DATABASE_URL) if Config.READ_DATABASE_URL else engine
+has_read_replica = read_engine is not engine
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
     expire_on_commit=False, # ⚠️ Objects will NOT be automatically refreshed after commit!
 )
+ReadSessionLocal = sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
 """
 Important Note:
 - `expire_on_commit=False` means objects **retain their state** after commit.
@@ -25,26 +72,20 @@ async def create_db_and_tables():
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def create_event():
-    """
-    Create a MYSQL event to delete unverified users every 5 minutes.
-    Important Note:
-    You need either the SUPER or SYSTEM_VARIABLES_ADMIN privilege in database.
-    """
-    async with engine.begin() as conn:
-        await conn.run_sync(lambda sync_conn: sync_conn.execute(text("""SET GLOBAL event_scheduler = ON;""")))
-        await conn.execute(text("""DROP EVENT IF EXISTS delete_unverified_users;"""))
-        await conn.execute(text("""
-            CREATE EVENT IF NOT EXISTS delete_unverified_users
-            ON SCHEDULE EVERY 5 MINUTE
-            DO
-            DELETE FROM users 
-            WHERE is_verified = FALSE 
-            AND created_at < NOW() - INTERVAL 1 HOUR
-            LIMIT 100;
-        """))
-        await conn.commit()
-        print("Event 'delete_unverified_users' has been created!")
+async def warm_pool(connections: int, target=engine):
+    """Open `connections` pooled connections up front so the first requests do not pay for the handshakes"""
+    conns = await asyncio.gather(*(target.connect() for _ in range(connections)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns))
+
+
+def get_pool_stats() -> dict:
+    stats = engine.pool.stats()
+    if has_read_replica:
+        stats["read_replica"] = read_engine.pool.stats()
+    return stats
 
 
 async def get_session() -> AsyncSession:
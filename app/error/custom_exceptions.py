@@ -47,6 +47,40 @@ class ProductNotFound(CustomException):
     """Product not found"""
     pass
 
+class CartItemNotFound(CustomException):
+    """Product is not in the user's cart"""
+    pass
+
+class CartQuantityExceeded(CustomException):
+    """Adding the quantity would take a cart line over the per-product maximum"""
+    pass
+
+class EmptyCart(CustomException):
+    """User tried to check out an empty cart"""
+    pass
+
+class InsufficientStock(CustomException):
+    """A product in the order does not have enough stock"""
+    pass
+
+class CheckoutInProgress(CustomException):
+    """Another checkout of the same cart is still running"""
+    pass
+
+class InvalidCursor(CustomException):
+    """User has provided a malformed pagination cursor"""
+    pass
+
+class PasswordHashingBusy(CustomException):
+    """Too many password hashing jobs are already pending"""
+    pass
+
+class RateLimitExceeded(CustomException):
+    """Client has sent too many requests"""
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
 def create_exception_handler(
     status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -64,8 +98,21 @@ def create_exception_handler_with_headers(
 
 
 
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        content={
+            "message": "Too many requests. Please try again later.",
+            "error_code": "rate_limit_exceeded",
+        },
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 def register_all_errors(app: FastAPI):
     """Register all exception handlers"""
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
     app.add_exception_handler(
         EmailAlreadyExists,
         create_exception_handler(
@@ -167,6 +214,84 @@ def register_all_errors(app: FastAPI):
         )
     )
 
+    app.add_exception_handler(
+        CartItemNotFound,
+        create_exception_handler(
+            status_code=status.HTTP_404_NOT_FOUND,
+            initial_detail={
+                "message": "Product not found in cart",
+                "error_code": "cart_item_not_found"
+            }
+        )
+    )
+
+    app.add_exception_handler(
+        CartQuantityExceeded,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Quantity of a product in the cart would exceed the maximum",
+                "error_code": "cart_quantity_exceeded"
+            }
+        )
+    )
+
+    app.add_exception_handler(
+        EmptyCart,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Cart is empty",
+                "error_code": "empty_cart"
+            }
+        )
+    )
+
+    app.add_exception_handler(
+        InsufficientStock,
+        create_exception_handler(
+            status_code=status.HTTP_409_CONFLICT,
+            initial_detail={
+                "message": "One or more products do not have enough stock",
+                "error_code": "insufficient_stock"
+            }
+        )
+    )
+
+    app.add_exception_handler(
+        CheckoutInProgress,
+        create_exception_handler(
+            status_code=status.HTTP_409_CONFLICT,
+            initial_detail={
+                "message": "A checkout of this cart is already in progress",
+                "error_code": "checkout_in_progress"
+            }
+        )
+    )
+
+    app.add_exception_handler(
+        InvalidCursor,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Invalid pagination cursor",
+                "error_code": "invalid_cursor"
+            }
+        )
+    )
+
+    app.add_exception_handler(
+        PasswordHashingBusy,
+        create_exception_handler_with_headers(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "Server is busy. Please try again shortly.",
+                "error_code": "password_hashing_busy"
+            },
+            headers={"Retry-After": "1"},
+        )
+    )
+
     # app.exception_handler(ValueError)
     # async def custom_value_error_handler(request: Request, exc: ValueError):
     #     error_message = str(exc).lower()
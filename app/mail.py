@@ -1,3 +1,8 @@
+import time
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, make_msgid
+
+import aiosmtplib
 from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
 from app.config import Config
 from pathlib import Path
@@ -27,4 +32,120 @@ def create_message(recipients: list[str], subject: str, body: str):
         recipients=recipients, subject=subject, body=body, subtype=MessageType.html
     )
 
-    return message
\ No newline at end of file
+    return message
+
+
+def build_email(message: MessageSchema, sender: str) -> EmailMessage:
+    """
+    MIME message for the pooled sender, built with the standard library instead of fastapi-mail internals.
+    Covers what `create_message` produces: recipients, cc/bcc, subject and a plain or html body.
+    """
+    email = EmailMessage()
+    email["From"] = sender
+    email["To"] = ", ".join(message.recipients)
+    if message.cc:
+        email["Cc"] = ", ".join(message.cc)
+    if message.bcc:
+        email["Bcc"] = ", ".join(message.bcc)  # aiosmtplib sends to Bcc and strips the header
+    email["Subject"] = message.subject
+    email["Date"] = formatdate(localtime=True)
+    email["Message-ID"] = make_msgid()
+    email.set_content(message.body or "", subtype=message.subtype.value)
+    return email
+
+
+class SMTPPool:
+    """
+    One SMTP session per worker process, reused across messages and tasks.
+
+    Important Note:
+    - The session is bound to the event loop it was opened on, drive the pool from a single long-lived loop.
+    - Sessions are recycled after `max_messages` sends or `idle_seconds` without use,
+      most servers drop idle clients or cap messages per connection.
+    - A dropped connection is reopened once and the message retried.
+    """
+
+    def __init__(self, config: ConnectionConfig, max_messages: int = 100, idle_seconds: int = 60):
+        self.config = config
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self.sender = (
+            formataddr((config.MAIL_FROM_NAME, config.MAIL_FROM))
+            if config.MAIL_FROM_NAME
+            else config.MAIL_FROM
+        )
+        self._session_client: aiosmtplib.SMTP | None = None
+        self._session_messages = 0
+        self._last_used = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.connections_opened = 0
+        self.send_seconds = 0.0
+
+    async def _session(self) -> aiosmtplib.SMTP:
+        expired = (
+            self._session_messages >= self.max_messages
+            or time.monotonic() - self._last_used > self.idle_seconds
+        )
+        if self._session_client is not None and (expired or not self._session_client.is_connected):
+            await self.close()
+        if self._session_client is None:
+            client = aiosmtplib.SMTP(
+                hostname=self.config.MAIL_SERVER,
+                port=self.config.MAIL_PORT,
+                timeout=self.config.TIMEOUT,
+                use_tls=self.config.MAIL_SSL_TLS,
+                start_tls=self.config.MAIL_STARTTLS,
+                validate_certs=self.config.VALIDATE_CERTS,
+            )
+            await client.connect()
+            if self.config.USE_CREDENTIALS:
+                await client.login(
+                    self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value()
+                )
+            self._session_client = client
+            self._session_messages = 0
+            self.connections_opened += 1
+        return self._session_client
+
+    async def close(self):
+        if self._session_client is not None:
+            client, self._session_client = self._session_client, None
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+    async def send(self, message: MessageSchema):
+        msg = build_email(message, self.sender)
+        start = time.perf_counter()
+        try:
+            try:
+                await (await self._session()).send_message(msg)
+            except aiosmtplib.SMTPServerDisconnected:
+                await self.close()
+                await (await self._session()).send_message(msg)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._last_used = time.monotonic()
+            self.send_seconds += time.perf_counter() - start
+        self._session_messages += 1
+        self.sent += 1
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "connections_opened": self.connections_opened,
+            "send_seconds": round(self.send_seconds, 3),
+            "messages_per_second": round(self.sent / self.send_seconds, 1) if self.send_seconds else None,
+        }
+
+
+smtp_pool = SMTPPool(
+    mail_config,
+    max_messages=Config.MAIL_POOL_MAX_MESSAGES,
+    idle_seconds=Config.MAIL_POOL_IDLE_SECONDS,
+)
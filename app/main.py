@@ -1,13 +1,21 @@
+import asyncio
+import time
 from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from redis.exceptions import RedisError
 from app.auth.routes import oauth_route
 from app.product.routes import product_route
 from app.category.routes import category_route
-from app.db.session import create_event, engine, AsyncSessionLocal
+from app.cart.routes import cart_route
+from app.order.routes import order_route
+from app.db.session import engine, read_engine, has_read_replica, AsyncSessionLocal, warm_pool
+from app.db.redis import revocation_cache, token_blocklist
 from app.auth.schemas import AdminCreateModel
 from app.auth.services import AdminService
 from app.config import Config
 from app.error.custom_exceptions import register_all_errors
+from app.db.profiler import SQLProfilerMiddleware
+from app.metrics import MetricsMiddleware, metrics_response
 
 
 description = """
@@ -24,16 +32,50 @@ version_prefix = Config.VERSION
 admin_service = AdminService()
 
 
+class StartupTimer:
+    """Collect per-phase durations of the startup, printed as one line once it is done"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    def summary(self) -> str:
+        total = (time.perf_counter() - self.start) * 1000
+        phases = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.phases.items())
+        return f"Startup finished in {total:.1f}ms ({phases})"
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Connecting to MySQL and setting up event...")
-    async with engine.begin() as conn:
-        await create_event()
-    async with AsyncSessionLocal() as session:
-        admin_data = AdminCreateModel()
-        await admin_service.create_admin(admin_data=admin_data, session=session)
+    timer = StartupTimer()
+    with timer.phase("db_pool"):
+        await warm_pool(min(Config.DB_POOL_WARM_CONNECTIONS, Config.DB_POOL_SIZE))
+        if has_read_replica:
+            await warm_pool(min(Config.DB_POOL_WARM_CONNECTIONS, Config.DB_POOL_SIZE), read_engine)
+    with timer.phase("redis"):
+        try:
+            await token_blocklist.ping()
+        except RedisError as e:
+            print(f"Redis unavailable at startup: {str(e)}")
+    with timer.phase("admin_bootstrap"):
+        async with AsyncSessionLocal() as session:
+            admin_data = AdminCreateModel()
+            await admin_service.bootstrap_admin(admin_data=admin_data, session=session)
+    print(timer.summary())
+    blocklist_sync = asyncio.create_task(revocation_cache.listen())
     yield
+    blocklist_sync.cancel()
     await engine.dispose()
+    if has_read_replica:
+        await read_engine.dispose()
     print("Database connection closed.")
 
 
@@ -54,9 +96,21 @@ app = FastAPI(
 )
 
 register_all_errors(app)
+app.add_middleware(MetricsMiddleware)
+if Config.SQL_PROFILER:
+    app.add_middleware(SQLProfilerMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the route, DB and Redis metrics of this worker"""
+    return metrics_response()
+
 
 app.include_router(oauth_route, prefix=f"/{version_prefix}/auth", tags=["auth"])
 app.include_router(product_route, prefix=f"/{version_prefix}/products", tags=["product"])
 app.include_router(
     category_route, prefix=f"/{version_prefix}/category", tags=["category"]
 )
+app.include_router(cart_route, prefix=f"/{version_prefix}/cart", tags=["cart"])
+app.include_router(order_route, prefix=f"/{version_prefix}/orders", tags=["order"])
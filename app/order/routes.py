@@ -0,0 +1,49 @@
+import logging
+import uuid
+
+from fastapi import APIRouter, Depends, status
+from redis.exceptions import RedisError
+
+from app.auth.dependencies import RoleChecker, AccessTokenDep, WriteSessionDep
+from app.cart.services import CartServices
+from app.error.custom_exceptions import EmptyCart
+from app.order.schemas import OrderModel
+from app.order.services import OrderServices
+
+role_checker = Depends(RoleChecker(["admin", "user"]))
+cart_services = CartServices()
+order_services = OrderServices()
+
+order_route = APIRouter()
+
+
+@order_route.post(
+    "/checkout",
+    response_model=OrderModel,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[role_checker],
+)
+async def checkout(token_data: AccessTokenDep, session: WriteSessionDep):
+    """
+    Turn the current cart into an order and empty the cart.
+
+    Important Note:
+    - The cart is moved aside atomically before the transaction, items added meanwhile stay in the cart.
+    - A failed checkout puts the cart back. If Redis fails once the order is committed the order is still
+      returned; the next checkout sees the order id and drops the leftover cart instead of re-ordering it.
+    """
+    user_id = token_data.get("user_id")
+    order_id = uuid.uuid4()
+    cart = await cart_services.take_cart_for_checkout(user_id, order_id)
+    if cart is None or not cart.items:
+        raise EmptyCart()
+    try:
+        new_order = await order_services.checkout(user_id, cart.items, session, order_id)
+    except Exception:
+        await cart_services.restore_cart(user_id)
+        raise
+    try:
+        await cart_services.finish_checkout(user_id)
+    except RedisError as e:
+        logging.error(f"Order {order_id} committed but its cart was not cleared: {str(e)}")
+    return new_order
@@ -0,0 +1,14 @@
+import uuid
+from decimal import Decimal
+from pydantic import BaseModel, Field
+
+class OrderItemModel(BaseModel):
+    product_id: uuid.UUID
+    quantity: int
+    price_at_order: Decimal = Field(default=0, max_digits=12, decimal_places=2)
+    vat_rate: float
+
+class OrderModel(BaseModel):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    items: list[OrderItemModel]
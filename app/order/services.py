@@ -0,0 +1,70 @@
+import uuid
+from datetime import date
+
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.cart.schemas import CartItemModel
+from app.db.models import Order, OrderItem, Product
+from app.error.custom_exceptions import InsufficientStock
+from app.order.schemas import OrderModel, OrderItemModel
+
+
+class OrderServices:
+    async def checkout(
+        self,
+        user_id: str,
+        items: list[CartItemModel],
+        session: AsyncSession,
+        order_id: uuid.UUID | None = None,
+    ) -> OrderModel:
+        """
+        Create an order from cart items in one transaction.
+
+        Important Note:
+        - Stock is taken with `UPDATE ... SET stock = stock - q WHERE id = ? AND stock >= q`,
+          so concurrent buyers can never oversell and no row is read-modified-written.
+        - Rows are updated in product_id order so concurrent checkouts lock them in the same
+          order and cannot deadlock.
+        - `price_at_order` is read from the locked product rows, not from the cart snapshot.
+        """
+        items = sorted(items, key=lambda item: item.product_id)
+        try:
+            for item in items:
+                statement = (
+                    update(Product)
+                    .where(Product.id == item.product_id, Product.stock >= item.quantity)
+                    .values(stock=Product.stock - item.quantity)
+                )
+                result = await session.exec(statement)
+                if result.rowcount != 1:
+                    raise InsufficientStock()
+
+            statement = select(Product.id, Product.price).where(
+                Product.id.in_([item.product_id for item in items])
+            )
+            prices = dict((await session.exec(statement)).all())
+
+            new_order = Order(id=order_id or uuid.uuid4(), user_id=uuid.UUID(user_id))
+            order_items = [
+                OrderItem(
+                    order_id=new_order.id,
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    price_at_order=prices[item.product_id],
+                    create=date.today(),
+                )
+                for item in items
+            ]
+            session.add(new_order)
+            session.add_all(order_items)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        return OrderModel(
+            id=new_order.id,
+            user_id=new_order.user_id,
+            items=[OrderItemModel.model_validate(item, from_attributes=True) for item in order_items],
+        )
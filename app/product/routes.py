@@ -1,55 +1,183 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from starlette.responses import JSONResponse
+import uuid
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from starlette.responses import JSONResponse, StreamingResponse
 
 from app.db.models import Product
-from app.auth.dependencies import SessionDep, RoleChecker, AccessTokenBearer
-from typing import Annotated
+from app.auth.dependencies import ReadSessionDep, WriteSessionDep, RoleChecker, AccessTokenDep
+from typing import Annotated, Literal
 
 from app.error.custom_exceptions import ProductNotFound
 from app.product.services import ProductServices
-from app.product.schemas import ProductCreateModel
+from app.product.schemas import (
+    ProductCreateModel,
+    ProductUpdateModel,
+    ProductPage,
+    BulkImportReport,
+    ProductBatchRequest,
+    ProductBatchResponse,
+    ProductBulkDeleteRequest,
+)
+from app.product.utils import iter_lines, iter_import_records
+from app.config import Config
+from app.db.routing import read_your_writes
+from app.db.etag import row_etag, collection_etag, etag_matches, not_modified
+from app.responses import FastJSONResponse
+from pydantic import TypeAdapter
 
-access_token_bearer = AccessTokenBearer()
 admin_role_checker = Depends(RoleChecker(["admin"]))
 role_checker = Depends(RoleChecker(["admin", "user"]))
 product_services = ProductServices()
 
 product_route = APIRouter()
 
+product_page_adapter = TypeAdapter(ProductPage)
+
 
-@product_route.get("/", response_model=list[Product], dependencies=[role_checker])
+@product_route.get("/", response_model=ProductPage, dependencies=[role_checker])
 async def get_product(
-    session: SessionDep, _: Annotated[dict, Depends(access_token_bearer)]
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    _: AccessTokenDep,
+    limit: Annotated[int, Query(ge=1)] = Config.PAGE_SIZE_DEFAULT,
+    cursor: str | None = None,
+):
+    """List products newest first. Pass `next_cursor` back as `cursor` to get the next page"""
+    page = await product_services.get_product(session, limit, cursor)
+    etag = collection_etag(page["items"], page["next_cursor"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if Config.FAST_JSON_RESPONSES:
+        return FastJSONResponse(
+            ProductPage.model_construct(**page), product_page_adapter, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return page
+
+
+@product_route.get("/search", response_model=ProductPage, dependencies=[role_checker])
+async def search_products(
+    session: ReadSessionDep,
+    _: AccessTokenDep,
+    q: Annotated[str | None, Query(max_length=256)] = None,
+    category_id: uuid.UUID | None = None,
+    min_price: Annotated[Decimal | None, Query(ge=0)] = None,
+    max_price: Annotated[Decimal | None, Query(ge=0)] = None,
+    in_stock: bool | None = None,
+    limit: Annotated[int, Query(ge=1)] = Config.PAGE_SIZE_DEFAULT,
+    cursor: str | None = None,
+):
+    """Full-text search on SKU and description, with category, price and stock filters"""
+    page = await product_services.search_products(
+        session,
+        limit,
+        cursor,
+        q=q,
+        category_id=category_id,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+    )
+    if Config.FAST_JSON_RESPONSES:
+        return FastJSONResponse(ProductPage.model_construct(**page), product_page_adapter)
+    return page
+
+
+@product_route.post(
+    "/batch", response_model=ProductBatchResponse, dependencies=[role_checker]
+)
+async def get_products_batch(
+    batch_data: ProductBatchRequest, session: ReadSessionDep, _: AccessTokenDep
 ):
-    products = await product_services.get_product(session)
+    """Look up many products by id and/or SKU. Results follow the request order, misses have `found: false`"""
+    products = await product_services.get_products_batch(
+        batch_data.ids, batch_data.skus, session
+    )
     return products
 
 
+@product_route.get("/export", dependencies=[admin_role_checker])
+async def export_products(
+    token_data: AccessTokenDep, content_format: Literal["ndjson", "csv"] = "ndjson"
+):
+    """Stream the whole catalog as NDJSON (default) or CSV"""
+    session_factory = await read_your_writes.sessionmaker_for(token_data.get("user_id"))
+
+    async def body():
+        # The response outlives request dependencies, so the stream owns its session
+        async with session_factory() as session:
+            async for chunk in product_services.export_products(content_format, session):
+                yield chunk
+
+    media_type = "text/csv" if content_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=products.{content_format}"},
+    )
+
+
 @product_route.get(
     "/{product_item}", response_model=Product, dependencies=[role_checker]
 )
 async def get_product_item(
     product_item: str,
-    session: SessionDep,
-    _: Annotated[dict, Depends(access_token_bearer)],
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    _: AccessTokenDep,
 ) -> dict:
     product = await product_services.get_product_item(product_item, session)
     if product is None:
         raise ProductNotFound()
+    etag = row_etag(product.id, product.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return product
 
 
 @product_route.post("/", response_model=Product, dependencies=[admin_role_checker])
 async def create_product(
     product_data: ProductCreateModel,
-    token_data: Annotated[dict, Depends(access_token_bearer)],
-    session: SessionDep,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
 ):
     user_id = token_data.get("user_id")
     new_product = await product_services.create_product(product_data, user_id, session)
     return new_product
 
 
+@product_route.post(
+    "/bulk_import", response_model=BulkImportReport, dependencies=[admin_role_checker]
+)
+async def bulk_import_products(
+    request: Request,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
+):
+    """
+    Import products from a streamed `text/csv` (with header row) or `application/x-ndjson` body.
+    Existing SKUs are updated. Rows that fail are listed in the report, the others are imported.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "text/csv":
+        content_format = "csv"
+    elif content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        content_format = "ndjson"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use Content-Type text/csv or application/x-ndjson",
+        )
+    user_id = token_data.get("user_id")
+    records = iter_import_records(iter_lines(request.stream()), content_format)
+    report = await product_services.bulk_import(records, user_id, session)
+    return report
+
+
 @product_route.put(
     "/update_product/{product_item}",
     response_model=Product,
@@ -58,8 +186,8 @@ async def create_product(
 async def update_product(
     product_item: str,
     product_data: ProductCreateModel,
-    token_data: Annotated[dict, Depends(access_token_bearer)],
-    session: SessionDep,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
 ):
     user_id = token_data.get("user_id")
     product_to_update = await product_services.update_product(
@@ -69,8 +197,28 @@ async def update_product(
         raise ProductNotFound()
     return product_to_update
 
+
+@product_route.patch("/{product_item}", dependencies=[admin_role_checker])
+async def patch_product(
+    product_item: str,
+    product_data: ProductUpdateModel,
+    token_data: AccessTokenDep,
+    session: WriteSessionDep,
+):
+    """Partial update: only the fields in the body are written"""
+    user_id = token_data.get("user_id")
+    updated_fields = await product_services.patch_product(
+        product_item, product_data, user_id, session
+    )
+    if updated_fields is None:
+        raise ProductNotFound()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"message": "Product is updated", "updated_fields": updated_fields},
+    )
+
 @product_route.delete("/delete_product/{product_item}", dependencies=[admin_role_checker])
-async def delete_product(product_item: str, session: SessionDep):
+async def delete_product(product_item: str, session: WriteSessionDep):
     product_to_delete = await product_services.delete_product(product_item, session)
     if product_to_delete is None:
         raise ProductNotFound()
@@ -80,3 +228,16 @@ async def delete_product(product_item: str, session: SessionDep):
             "message": f"Product is deleted"
         }
     )
+
+
+@product_route.post("/bulk_delete", dependencies=[admin_role_checker])
+async def bulk_delete_products(delete_data: ProductBulkDeleteRequest, session: WriteSessionDep):
+    deleted = await product_services.bulk_delete_products(delete_data.ids, session)
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Products are deleted",
+            "requested": len(delete_data.ids),
+            "deleted": deleted,
+        },
+    )
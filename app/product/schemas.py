@@ -1,15 +1,75 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 import uuid
 from datetime import date
 from decimal import Decimal
+from app.db.models import Product
+from app.config import Config
+
+STOCK_MAX = 2**31 - 1  # Product.stock is a signed INT column
 
 class ProductCreateModel(BaseModel):
     sku: str = Field(default=None, max_length=64, min_length=1)
     description: str | None = Field(default=None, max_length=1024)
     price: Decimal = Field(default=0, max_digits=12, decimal_places=2)
-    stock: int
+    stock: int = Field(ge=0, le=STOCK_MAX)
     category_id: uuid.UUID
     created_at: date
 
 
+class ProductUpdateModel(BaseModel):
+    sku: str | None = Field(default=None, max_length=64, min_length=1)
+    description: str | None = Field(default=None, max_length=1024)
+    price: Decimal | None = Field(default=None, max_digits=12, decimal_places=2)
+    stock: int | None = Field(default=None, ge=0, le=STOCK_MAX)
+    category_id: uuid.UUID | None = None
+    created_at: date | None = None
+
+    @model_validator(mode="after")
+    def reject_null_for_required_columns(self):
+        """Omitted fields are left unchanged; only category_id may be explicitly set to null"""
+        nulls = [name for name in self.model_fields_set if name != "category_id" and getattr(self, name) is None]
+        if nulls:
+            raise ValueError(f"{', '.join(sorted(nulls))} cannot be null")
+        return self
+
+
+class ProductPage(BaseModel):
+    items: list[Product]
+    next_cursor: str | None = None
+
+
+class BulkImportRowError(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class BulkImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    errors: list[BulkImportRowError] = []
+
+
+class ProductBatchRequest(BaseModel):
+    ids: list[uuid.UUID] = []
+    skus: list[str] = []
+
+    @model_validator(mode="after")
+    def check_size(self):
+        if len(self.ids) + len(self.skus) > Config.PRODUCT_BATCH_MAX_KEYS:
+            raise ValueError(f"At most {Config.PRODUCT_BATCH_MAX_KEYS} ids and SKUs per request")
+        return self
+
+
+class ProductLookup(BaseModel):
+    key: str
+    found: bool
+    product: Product | None = None
+
+
+class ProductBatchResponse(BaseModel):
+    ids: list[ProductLookup]
+    skus: list[ProductLookup]
+
 
+class ProductBulkDeleteRequest(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1)
@@ -1,20 +1,123 @@
+import csv
+import io
+import json
+import re
 import uuid
-from typing import Annotated
+from decimal import Decimal
+from typing import Annotated, AsyncIterator
 
-from app.product.schemas import ProductCreateModel
+from pydantic import ValidationError
+from sqlalchemy.dialects.mysql import insert as mysql_insert, match
+from app.product.schemas import (
+    ProductCreateModel,
+    ProductUpdateModel,
+    BulkImportReport,
+    BulkImportRowError,
+)
+from app.product.utils import encode_cursor, decode_cursor
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.db.models import Product
-from sqlmodel import select, desc
-from sqlalchemy.exc import IntegrityError
+from app.config import Config
+from sqlmodel import select, update, delete, desc, or_, and_
+from sqlalchemy.exc import DataError, IntegrityError
 from app.error.error_handler import DataBaseErrorHandler
 
 
 class ProductServices:
-    async def get_product(self, session: AsyncSession):
-        statement = select(Product).order_by(desc(Product.created_at))
-        results = await session.exec(statement)
+    async def get_product(
+        self, session: AsyncSession, limit: int, cursor: str | None = None
+    ):
+        """Return one page of products, newest first, keyed on (created_at, id)"""
+        return await self._paginate(select(Product), session, limit, cursor)
+
+    async def search_products(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        q: str | None = None,
+        category_id: uuid.UUID | None = None,
+        min_price: Decimal | None = None,
+        max_price: Decimal | None = None,
+        in_stock: bool | None = None,
+    ):
+        """
+        Filter products and return one page, newest first.
+
+        Important Note:
+        - `q` runs a MySQL FULLTEXT match on (sku, description); every word must match,
+          as a prefix. Boolean-mode operators typed by the user are dropped.
+        - Category filters use ix_product_category_id_created_at_id, which also serves the sort.
+        """
+        statement = select(Product)
+        if q:
+            terms = " ".join(f"+{word}*" for word in re.findall(r"\w+", q))
+            if terms:
+                statement = statement.where(
+                    match(Product.sku, Product.description, against=terms).in_boolean_mode()
+                )
+        if category_id is not None:
+            statement = statement.where(Product.category_id == category_id)
+        if min_price is not None:
+            statement = statement.where(Product.price >= min_price)
+        if max_price is not None:
+            statement = statement.where(Product.price <= max_price)
+        if in_stock is True:
+            statement = statement.where(Product.stock > 0)
+        elif in_stock is False:
+            statement = statement.where(Product.stock <= 0)
+        return await self._paginate(statement, session, limit, cursor)
+
+    async def _paginate(self, statement, session: AsyncSession, limit: int, cursor: str | None):
+        limit = min(limit, Config.PAGE_SIZE_MAX)
+        statement = statement.order_by(desc(Product.created_at), desc(Product.id))
+        if cursor is not None:
+            created_at, product_id = decode_cursor(cursor)
+            statement = statement.where(
+                or_(
+                    Product.created_at < created_at,
+                    and_(Product.created_at == created_at, Product.id < product_id),
+                )
+            )
+        results = await session.exec(statement.limit(limit + 1))  # One extra row tells us if there is a next page
         products = results.all()
-        return products
+
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return {"items": products, "next_cursor": next_cursor}
+
+    async def export_products(self, content_format: str, session: AsyncSession) -> AsyncIterator[str]:
+        """
+        Stream every product as NDJSON or CSV text chunks.
+
+        Important Note:
+        - Rows come from a server-side cursor, EXPORT_YIELD_PER at a time, and are
+          serialized straight from the row tuples (no ORM objects, no response_model).
+        - Memory stays flat whatever the catalog size.
+        """
+        columns = list(Product.__table__.columns)
+        statement = select(*columns).execution_options(yield_per=Config.EXPORT_YIELD_PER)
+        result = await session.stream(statement)
+
+        if content_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow([column.name for column in columns])
+            yield buffer.getvalue()
+
+        async for partition in result.partitions():
+            if content_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(partition)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(row._mapping), default=str) + "\n" for row in partition
+                )
 
     async def get_product_item(self, product_item: str, session: AsyncSession):
         statement = select(Product).where(Product.id == uuid.UUID(product_item))
@@ -22,6 +125,30 @@ class ProductServices:
         product = result.first()
         return product
 
+    async def get_products_batch(
+        self, ids: list[uuid.UUID], skus: list[str], session: AsyncSession
+    ) -> dict:
+        """Resolve many ids and SKUs with one IN (...) query, keeping the request order"""
+        if not ids and not skus:
+            return {"ids": [], "skus": []}
+        statement = select(Product).where(
+            or_(Product.id.in_(set(ids)), Product.sku.in_(set(skus)))
+        )
+        results = await session.exec(statement)
+        products = results.all()
+        by_id = {product.id: product for product in products}
+        by_sku = {product.sku: product for product in products}
+        return {
+            "ids": [
+                {"key": str(product_id), "found": product_id in by_id, "product": by_id.get(product_id)}
+                for product_id in ids
+            ],
+            "skus": [
+                {"key": sku, "found": sku in by_sku, "product": by_sku.get(sku)}
+                for sku in skus
+            ],
+        }
+
     async def create_product(
         self, product_data: ProductCreateModel, user_id: str, session: AsyncSession
     ):
@@ -48,7 +175,7 @@ class ProductServices:
         product_to_update = await self.get_product_item(product_item, session)
 
         if product_to_update is not None:
-            update_data_dict = product_to_update.model_dump()
+            update_data_dict = update_data.model_dump()
 
             for k, v in update_data_dict.items():
                 setattr(product_to_update, k, v)
@@ -61,13 +188,125 @@ class ProductServices:
         else:
             return None
 
+    async def patch_product(
+        self,
+        product_item: str,
+        update_data: ProductUpdateModel,
+        user_id: str,
+        session: AsyncSession,
+    ) -> list[str] | None:
+        """Write only the fields sent, in one UPDATE. Returns the updated field names, None if not found"""
+        update_data_dict = update_data.model_dump(exclude_unset=True)
+        statement = (
+            update(Product)
+            .where(Product.id == uuid.UUID(product_item))
+            .values(**update_data_dict, user_id=uuid.UUID(user_id))
+        )
+        try:
+            result = await session.exec(statement)
+            await session.commit()
+        except IntegrityError as e:
+            await DataBaseErrorHandler.handler_integrity_error(e, session, "product")
+        if result.rowcount == 0:
+            return None
+        return list(update_data_dict)
+
     async def delete_product(self, product_item: str, session: AsyncSession):
-        product_to_delete = await self.get_product_item(product_item, session)
+        statement = delete(Product).where(Product.id == uuid.UUID(product_item))
+        try:
+            result = await session.exec(statement)
+            await session.commit()
+        except IntegrityError as e:
+            await DataBaseErrorHandler.handler_integrity_error(e, session, "product")
+        return True if result.rowcount else None
+
+    async def bulk_delete_products(self, product_ids: list[uuid.UUID], session: AsyncSession) -> int:
+        """
+        Delete products by id, BULK_DELETE_CHUNK_SIZE per statement and transaction.
+        If a chunk fails (e.g. a product is still in an order), earlier chunks stay deleted.
+        """
+        deleted = 0
+        unique_ids = list(dict.fromkeys(product_ids))
+        for start in range(0, len(unique_ids), Config.BULK_DELETE_CHUNK_SIZE):
+            chunk = unique_ids[start:start + Config.BULK_DELETE_CHUNK_SIZE]
+            try:
+                result = await session.exec(delete(Product).where(Product.id.in_(chunk)))
+                await session.commit()
+            except IntegrityError as e:
+                await DataBaseErrorHandler.handler_integrity_error(e, session, "product")
+            deleted += result.rowcount
+        return deleted
 
-        if product_to_delete is not None:
-            await session.delete(product_to_delete)
+    async def bulk_import(
+        self,
+        records: AsyncIterator[tuple[int, dict | ValueError]],
+        user_id: str,
+        session: AsyncSession,
+    ) -> BulkImportReport:
+        """Validate streamed rows and upsert them on `sku` in batches of BULK_IMPORT_BATCH_SIZE"""
+        report = BulkImportReport()
+        owner_id = uuid.UUID(user_id)
+        batch: list[tuple[int, dict]] = []
+
+        async for line, record in records:
+            report.processed += 1
+            if isinstance(record, ValueError):
+                report.errors.append(BulkImportRowError(line=line, errors=[str(record)]))
+                continue
+            try:
+                product_data = ProductCreateModel.model_validate(record)
+            except ValidationError as e:
+                report.errors.append(
+                    BulkImportRowError(
+                        line=line,
+                        errors=[
+                            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                            for error in e.errors()
+                        ],
+                    )
+                )
+                continue
+            batch.append(
+                (line, {"id": uuid.uuid4(), **product_data.model_dump(), "user_id": owner_id})
+            )
+            if len(batch) >= Config.BULK_IMPORT_BATCH_SIZE:
+                await self._import_batch(batch, session, report)
+                batch = []
+
+        if batch:
+            await self._import_batch(batch, session, report)
+        return report
+
+    async def _import_batch(
+        self, batch: list[tuple[int, dict]], session: AsyncSession, report: BulkImportReport
+    ) -> None:
+        try:
+            await session.exec(self._upsert_statement([row for _, row in batch]))
             await session.commit()
+            report.imported += len(batch)
+            return
+        except (IntegrityError, DataError):
+            await session.rollback()
 
-            return product_to_delete
-        else:
-            return None
+        # One row broke the multi-row statement (constraint or out-of-range value), retry row by row to find out which
+        for line, row in batch:
+            try:
+                await session.exec(self._upsert_statement([row]))
+                await session.commit()
+                report.imported += 1
+            except (IntegrityError, DataError) as e:
+                await session.rollback()
+                report.errors.append(BulkImportRowError(line=line, errors=[str(e.orig)]))
+
+    @staticmethod
+    def _upsert_statement(rows: list[dict]):
+        statement = mysql_insert(Product).values(rows)
+        return statement.on_duplicate_key_update(
+            {
+                **{
+                    column: statement.inserted[column]
+                    for column in ("description", "price", "stock", "category_id", "created_at", "user_id")
+                },
+                "version": Product.version + 1,  # onupdate is not applied to upserts
+            }
+        )
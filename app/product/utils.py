@@ -0,0 +1,74 @@
+import base64
+import codecs
+import csv
+import json
+import uuid
+from datetime import date
+from typing import AsyncIterator
+
+from app.error.custom_exceptions import InvalidCursor
+
+
+def encode_cursor(created_at: date, product_id: uuid.UUID) -> str:
+    payload = json.dumps({"created_at": created_at.isoformat(), "id": str(product_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(payload["created_at"]), uuid.UUID(payload["id"])
+    except Exception:
+        raise InvalidCursor()
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed request body into text lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_import_records(
+    lines: AsyncIterator[str], content_format: str
+) -> AsyncIterator[tuple[int, dict | ValueError]]:
+    """
+    Yield (line_number, record) pairs from NDJSON or CSV lines.
+
+    Important Note:
+    - A line that cannot be parsed is yielded as a ValueError so the caller can report it.
+    - CSV needs a header row; quoted fields must not span several lines.
+    - Empty CSV cells are read as missing values.
+    """
+    header = None
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        if content_format == "ndjson":
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Expected a JSON object")
+            except ValueError as e:
+                yield line_number, ValueError(f"Invalid JSON: {str(e)}")
+                continue
+            yield line_number, record
+        else:
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [column.strip() for column in values]
+                continue
+            if len(values) != len(header):
+                yield line_number, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+                continue
+            yield line_number, {k: v for k, v in zip(header, values) if v != ""}
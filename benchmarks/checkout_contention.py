@@ -0,0 +1,119 @@
+"""
+Many buyers checking out the same SKU at once, against the database in DATABASE_URL.
+
+Usage:
+    python benchmarks/checkout_contention.py --stock 100 --buyers 500 --concurrency 50
+
+Creates a throwaway user, category and product, runs `OrderServices.checkout` for every buyer
+(quantity 1 each) with `--concurrency` sessions in flight, then checks that exactly `--stock`
+orders succeeded, that stock ended at zero and never went negative, and prints throughput.
+Everything created is removed at the end.
+
+tests/test_checkout.py runs the same no-overselling check on SQLite with the test suite,
+this script is for throughput numbers against MySQL.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date
+
+from sqlmodel import delete, select
+
+from app.cart.schemas import CartItemModel
+from app.db.models import Category, Order, OrderItem, Product, User
+from app.db.session import AsyncSessionLocal, engine
+from app.error.custom_exceptions import InsufficientStock
+from app.order.services import OrderServices
+
+order_services = OrderServices()
+
+
+async def setup(stock: int) -> tuple[User, Category, Product]:
+    async with AsyncSessionLocal() as session:
+        tag = uuid.uuid4().hex[:8]
+        user = User(
+            email=f"bench-{tag}@example.com",
+            username=f"bench-{tag}",
+            last_name="bench",
+            first_name="bench",
+            hashed_password="",
+            role="user",
+            is_verified=True,
+        )
+        category = Category(name=f"bench-{tag}")
+        session.add_all([user, category])
+        await session.commit()
+        product = Product(
+            sku=f"bench-{tag}",
+            description="checkout contention benchmark",
+            price=10,
+            stock=stock,
+            category_id=category.id,
+            created_at=date.today(),
+        )
+        session.add(product)
+        await session.commit()
+        return user, category, product
+
+
+async def teardown(user: User, category: Category, product: Product) -> None:
+    async with AsyncSessionLocal() as session:
+        order_ids = select(Order.id).where(Order.user_id == user.id)
+        await session.exec(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+        await session.exec(delete(Order).where(Order.user_id == user.id))
+        await session.exec(delete(Product).where(Product.id == product.id))
+        await session.exec(delete(Category).where(Category.id == category.id))
+        await session.exec(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+async def buy(user_id: str, product_id: uuid.UUID, slots: asyncio.Semaphore) -> bool:
+    async with slots:
+        async with AsyncSessionLocal() as session:
+            try:
+                await order_services.checkout(
+                    user_id, [CartItemModel(product_id=product_id, quantity=1, price_at_purchase=0)], session
+                )
+                return True
+            except InsufficientStock:
+                return False
+
+
+async def main(args: argparse.Namespace) -> None:
+    user, category, product = await setup(args.stock)
+    try:
+        slots = asyncio.Semaphore(args.concurrency)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(buy(str(user.id), product.id, slots) for _ in range(args.buyers))
+        )
+        elapsed = time.perf_counter() - start
+
+        async with AsyncSessionLocal() as session:
+            final_stock = (await session.exec(select(Product.stock).where(Product.id == product.id))).one()
+            ordered = (
+                await session.exec(
+                    select(OrderItem.quantity).where(OrderItem.product_id == product.id)
+                )
+            ).all()
+
+        succeeded = sum(results)
+        print(f"buyers={args.buyers} concurrency={args.concurrency} stock={args.stock}")
+        print(f"succeeded={succeeded} rejected={args.buyers - succeeded} final_stock={final_stock}")
+        print(f"throughput={args.buyers / elapsed:.1f} checkouts/s elapsed={elapsed:.2f}s")
+        assert succeeded == min(args.stock, args.buyers), "Oversold or lost orders"
+        assert sum(ordered) == succeeded, "Order items do not match successful checkouts"
+        assert final_stock == args.stock - succeeded >= 0, "Stock went out of sync"
+        print("OK: no overselling")
+    finally:
+        await teardown(user, category, product)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--buyers", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,71 @@
+"""
+One SMTP connection per email (FastMail.send_message) vs the pooled SMTP session used by the worker.
+
+Usage:
+    python benchmarks/email_batch.py --messages 500 --latency-ms 5
+
+Both paths send to the local SMTP sink of the test suite (plain SMTP, no TLS, no auth),
+which delays every reply by --latency-ms to stand in for the network round trip to a real relay.
+The sink also counts accepted messages and connections, so the run doubles as a correctness check.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi_mail import ConnectionConfig, FastMail
+
+from app.mail import SMTPPool, create_message
+from tests.smtp_sink import SMTPSink
+
+
+async def main(args):
+    sink = SMTPSink(args.latency_ms / 1000)
+    await sink.start()
+    config = ConnectionConfig(
+        MAIL_USERNAME="",
+        MAIL_PASSWORD="",
+        MAIL_FROM="bench@example.com",
+        MAIL_PORT=sink.port,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False,
+    )
+    messages = [
+        create_message([f"user{i}@example.com"], "Benchmark", "<p>hello</p>")
+        for i in range(args.messages)
+    ]
+
+    fast_mail = FastMail(config)
+    start = time.perf_counter()
+    for message in messages:
+        await fast_mail.send_message(message)
+    per_message = time.perf_counter() - start
+    print(
+        f"connection per email: {args.messages / per_message:8.1f} msg/s "
+        f"({sink.messages} accepted, {sink.connections} connections)"
+    )
+
+    sink.messages = sink.connections = 0
+    pool = SMTPPool(config, max_messages=args.max_messages)
+    start = time.perf_counter()
+    for message in messages:
+        await pool.send(message)
+    await pool.close()
+    pooled = time.perf_counter() - start
+    print(
+        f"pooled session:       {args.messages / pooled:8.1f} msg/s "
+        f"({sink.messages} accepted, {sink.connections} connections)  x{per_message / pooled:.1f}"
+    )
+    print(f"pool stats: {pool.stats()}")
+
+    await sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--max-messages", type=int, default=100, help="messages per pooled session")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+p99 latency of `GET /products/` while a burst of logins hits `/auth/token`.
+
+Usage (against a running server):
+    python benchmarks/login_storm.py --base-url http://localhost:8000/v1 --username admin --password secret
+
+The script measures the product listing alone first, then again while `--login-concurrency`
+clients log in continuously. With bcrypt running on the event loop the second p99 jumps by
+roughly the cost of a hash times the number of concurrent logins.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summary(samples: list[float]) -> str:
+    return (
+        f"n={len(samples)} p50={percentile(samples, 50):.1f}ms "
+        f"p95={percentile(samples, 95):.1f}ms p99={percentile(samples, 99):.1f}ms "
+        f"mean={statistics.fmean(samples):.1f}ms"
+    )
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> httpx.Response:
+    return await client.post("/auth/token", data={"username": username, "password": password})
+
+
+async def probe_products(client: httpx.AsyncClient, token: str, duration: float) -> list[float]:
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/products/", headers={"Authorization": f"Bearer {token}"})
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def login_storm(client: httpx.AsyncClient, username: str, password: str, stop: asyncio.Event) -> int:
+    count = 0
+    while not stop.is_set():
+        await login(client, username, password)
+        count += 1
+    return count
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.login_concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        response = await login(client, args.username, args.password)
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        print(f"baseline        {summary(await probe_products(client, token, args.duration))}")
+
+        stop = asyncio.Event()
+        storm = [
+            asyncio.create_task(login_storm(client, args.username, args.password, stop))
+            for _ in range(args.login_concurrency)
+        ]
+        samples = await probe_products(client, token, args.duration)
+        stop.set()
+        logins = sum(await asyncio.gather(*storm))
+        print(f"during storm    {summary(samples)} logins={logins}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/v1")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Default response_model serialization vs FastJSONResponse for product lists.
+
+Usage:
+    python benchmarks/serialization.py --sizes 1000 10000 100000 --repeat 5
+
+Both routes return the same prebuilt list of `Product` rows through a real FastAPI app
+(in-process ASGI, no network, no database), so the timings only cover serialization.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import httpx
+from fastapi import FastAPI
+from pydantic import TypeAdapter
+
+from app.db.models import Product
+from app.responses import FastJSONResponse
+
+
+def build_app(products: list[Product]) -> FastAPI:
+    bench_app = FastAPI()
+    adapter = TypeAdapter(list[Product])
+
+    @bench_app.get("/default", response_model=list[Product])
+    async def default_path():
+        return products
+
+    @bench_app.get("/fast", response_model=list[Product])
+    async def fast_path():
+        return FastJSONResponse(products, adapter)
+
+    return bench_app
+
+
+def build_products(count: int) -> list[Product]:
+    category_id = uuid.uuid4()
+    return [
+        Product(
+            sku=f"SKU-{i:07d}",
+            description="Benchmark product with a reasonably long description",
+            price=Decimal("1234.56"),
+            stock=i % 100,
+            category_id=category_id,
+            created_at=date(2024, 1, 1),
+            user_id=category_id,
+        )
+        for i in range(count)
+    ]
+
+
+async def time_route(client: httpx.AsyncClient, path: str, repeat: int) -> tuple[float, bytes]:
+    samples = []
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(path)
+        samples.append(time.perf_counter() - start)
+        body = response.content
+    return statistics.median(samples) * 1000, body
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'rows':>8} {'default ms':>12} {'fast ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        bench_app = build_app(build_products(size))
+        transport = httpx.ASGITransport(app=bench_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            default_ms, default_body = await time_route(client, "/default", args.repeat)
+            fast_ms, fast_body = await time_route(client, "/fast", args.repeat)
+        assert httpx.Response(200, content=default_body).json() == httpx.Response(200, content=fast_body).json()
+        print(f"{size:>8} {default_ms:>12.1f} {fast_ms:>10.1f} {default_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,29 @@
+"""add product and category version
+
+Revision ID: 5d92a7be3f61
+Revises: c71d0e4f9a28
+Create Date: 2026-10-18 15:22:13.506842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d92a7be3f61'
+down_revision: Union[str, None] = 'c71d0e4f9a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('category', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('product', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('product', 'version')
+    op.drop_column('category', 'version')
@@ -0,0 +1,27 @@
+"""add cart quantity
+
+Revision ID: 8b4e6d21c5a3
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-18 11:47:05.392617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6d21c5a3'
+down_revision: Union[str, None] = '3f1c2a9b7d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cart', sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('cart', 'quantity')
@@ -0,0 +1,31 @@
+"""add product search indexes
+
+Revision ID: c71d0e4f9a28
+Revises: 8b4e6d21c5a3
+Create Date: 2026-10-18 14:05:51.774031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d0e4f9a28'
+down_revision: Union[str, None] = '8b4e6d21c5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_product_category_id_created_at_id', 'product', ['category_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_product_price', 'product', ['price'], unique=False)
+    op.create_index('ix_product_sku_description', 'product', ['sku', 'description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_sku_description', table_name='product')
+    op.drop_index('ix_product_price', table_name='product')
+    op.drop_index('ix_product_category_id_created_at_id', table_name='product')
@@ -0,0 +1,29 @@
+"""add user unverified cleanup index
+
+Revision ID: e4a7c3b91f52
+Revises: 5d92a7be3f61
+Create Date: 2026-10-18 17:41:08.219374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c3b91f52'
+down_revision: Union[str, None] = '5d92a7be3f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_is_verified_created_at', 'user', ['is_verified', 'created_at'], unique=False)
+    # Replaced by the delete_unverified_users Celery beat task
+    op.execute('DROP EVENT IF EXISTS delete_unverified_users')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_is_verified_created_at', table_name='user')
@@ -1,2 +1,3 @@
 celery -A app.celery_tasks.c_app worker -l info &
+celery -A app.celery_tasks.c_app beat -l info &
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Shared fixtures for the test suite.
+
+`app.main:app` runs in-process (lifespan included) against a fresh SQLite database (aiosqlite) and an
+in-memory fake Redis, the same stand-ins benchmarks/suite.py uses, so neither MySQL nor Redis is needed.
+Everything runs on one event loop for the whole session: the engine pool and the Redis client are
+module-level and bound to the loop that first used them.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+TEST_ENV = {
+    "DATABASE_URL": f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}",
+    "JWT_SECRET": "test",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRES_MINUTES": "60",
+    "REFRESH_TOKEN_EXPIRES_DAYS": "1",
+    "DOMAIN": "localhost",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "MAIL_USERNAME": "test",
+    "MAIL_PASSWORD": "test",
+    "MAIL_FROM": "test@example.com",
+    "MAIL_SERVER": "localhost",
+    "EMAIL_AD": "admin@example.com",
+    "USERNAME_AD": "admin",
+    "PASSWORD_AD": "test-password",
+    "VERSION": "v1",
+}
+# Must run before anything imports app.config
+os.environ.update(TEST_ENV)
+
+import fakeredis
+import httpx
+import pytest
+import redis.asyncio as aioredis
+from datetime import date
+
+from app.db.redis import token_blocklist
+
+# Every module shares this client, swapping its pool moves all Redis traffic to the fake
+token_blocklist.connection_pool = aioredis.ConnectionPool(
+    connection_class=fakeredis.aioredis.FakeConnection, server=fakeredis.FakeServer()
+)
+
+from app.auth.services import UserService
+from app.auth.utils import create_access_token
+from app.db.models import Category, Product, User
+from app.db.profiler import SQLProfilerMiddleware
+from app.db.session import AsyncSessionLocal, create_db_and_tables
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def started_app():
+    await create_db_and_tables()
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@pytest.fixture
+async def client(started_app):
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=started_app), base_url=f"http://test/{TEST_ENV['VERSION']}"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+async def profiled_client(started_app):
+    """
+    Client of the app as served with SQL_PROFILER enabled: every response carries the X-SQL-* headers
+    checked by `app.db.profiler.assert_query_budget`.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=SQLProfilerMiddleware(started_app)),
+        base_url=f"http://test/{TEST_ENV['VERSION']}",
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+async def admin(started_app) -> User:
+    async with AsyncSessionLocal() as session:
+        return await UserService().get_user(TEST_ENV["USERNAME_AD"], session)
+
+
+@pytest.fixture(scope="session")
+def admin_headers(admin) -> dict:
+    token = create_access_token({"email": admin.username, "user_id": str(admin.id), "role": admin.role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+async def catalog(started_app) -> tuple[Category, list[Product]]:
+    async with AsyncSessionLocal() as session:
+        category = Category(name="test")
+        session.add(category)
+        await session.commit()
+        products = [
+            Product(
+                sku=f"TEST-{i:04d}",
+                description=f"test product {i}",
+                price="9.99",
+                stock=100,
+                category_id=category.id,
+                created_at=date(2024, 1, 1),
+            )
+            for i in range(20)
+        ]
+        session.add_all(products)
+        await session.commit()
+        return category, products
@@ -0,0 +1,60 @@
+"""
+Local SMTP stand-in (plain SMTP, no TLS, no auth), shared by tests/test_mail.py and benchmarks/email_batch.py.
+
+It counts connections and accepted messages, can delay every reply to stand in for the network round
+trip to a real relay, refuses recipients listed in `refused`, and drops the connection on the next
+MAIL command when `drop_next_mail` is set.
+"""
+import asyncio
+
+
+class SMTPSink:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.connections = 0
+        self.messages = 0
+        self.refused: set[str] = set()
+        self.drop_next_mail = False
+        self.server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def reply(self, writer: asyncio.StreamWriter, line: str):
+        await asyncio.sleep(self.latency)
+        writer.write(line.encode() + b"\r\n")
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        await self.reply(writer, "220 sink ready")
+        while line := await reader.readline():
+            command = line.decode().strip()
+            verb = command.upper()
+            if verb.startswith("EHLO"):
+                await self.reply(writer, "250-sink\r\n250 8BITMIME")
+            elif verb.startswith("MAIL") and self.drop_next_mail:
+                self.drop_next_mail = False
+                break
+            elif verb.startswith("RCPT") and command.partition(":")[2].strip(" <>") in self.refused:
+                await self.reply(writer, "550 no such user")
+            elif verb == "DATA":
+                await self.reply(writer, "354 end with <CRLF>.<CRLF>")
+                while await reader.readline() not in (b".\r\n", b""):
+                    pass
+                self.messages += 1
+                await self.reply(writer, "250 queued")
+            elif verb == "QUIT":
+                await self.reply(writer, "221 bye")
+                break
+            else:
+                await self.reply(writer, "250 ok")
+        writer.close()
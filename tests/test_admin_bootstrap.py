@@ -0,0 +1,56 @@
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.auth.schemas import AdminCreateModel
+from app.auth.services import ADMIN_BOOTSTRAP_LOCK, ADMIN_BOOTSTRAP_MARKER, AdminService
+from app.config import Config
+from app.db.redis import token_blocklist as redis_client
+from app.db.session import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+admin_service = AdminService()
+
+
+async def bootstrap():
+    async with AsyncSessionLocal() as session:
+        return await admin_service.bootstrap_admin(AdminCreateModel(), session)
+
+
+async def admin_exists() -> bool:
+    async with AsyncSessionLocal() as session:
+        return await admin_service.get_user(Config.USERNAME_AD, session) is not None
+
+
+async def test_marker_expires(started_app):
+    assert await redis_client.ttl(ADMIN_BOOTSTRAP_MARKER) > 0
+
+
+async def test_deleted_admin_recreated_on_next_boot(started_app):
+    async with AsyncSessionLocal() as session:
+        assert await admin_service.delete_user_account(Config.USERNAME_AD, session)
+    assert not await redis_client.exists(ADMIN_BOOTSTRAP_MARKER)
+
+    await bootstrap()
+
+    assert await admin_exists()
+    assert await redis_client.exists(ADMIN_BOOTSTRAP_MARKER)
+
+
+async def test_redis_errors_after_create_do_not_abort_boot(started_app, monkeypatch):
+    execute_command = redis_client.execute_command
+    failing = {("SET", ADMIN_BOOTSTRAP_MARKER), ("DEL", ADMIN_BOOTSTRAP_LOCK)}
+
+    async def flaky_execute_command(*args, **options):
+        if (args[0], args[1]) in failing:
+            raise ConnectionError("down")
+        return await execute_command(*args, **options)
+
+    await redis_client.delete(ADMIN_BOOTSTRAP_MARKER)
+    monkeypatch.setattr(redis_client, "execute_command", flaky_execute_command)
+
+    await bootstrap()
+
+    assert await admin_exists()
+    monkeypatch.undo()
+    await redis_client.delete(ADMIN_BOOTSTRAP_LOCK)
@@ -0,0 +1,57 @@
+"""
+Redis and SQL round trips per authenticated request.
+
+The access token is decoded, checked against the blocklist and resolved to a user once per request only
+while every router shares `access_token_bearer`; a second `AccessTokenBearer()` would show up here as a
+second blocklist GET (and a second user SELECT).
+"""
+import pytest
+from sqlalchemy import event
+
+from app.db.redis import BLOCKLIST_PREFIX, revocation_cache, token_blocklist
+from app.db.session import engine
+
+pytestmark = pytest.mark.anyio
+
+# path -> SQL statements of a warm request while the blocklist subscription is healthy
+# (the user comes from the principal cache, categories from the category cache)
+WARM_STATEMENTS = {
+    "/products/": 1,
+    "/category/": 0,
+    "/auth/me": 0,
+}
+
+
+@pytest.fixture
+def call_counts(monkeypatch):
+    counts = {"blocklist_get": 0, "sql": 0}
+    execute_command = token_blocklist.execute_command
+
+    async def counting_execute_command(*args, **options):
+        if args[0] == "GET" and str(args[1]).startswith(BLOCKLIST_PREFIX):
+            counts["blocklist_get"] += 1
+        return await execute_command(*args, **options)
+
+    def count_statement(*args):
+        counts["sql"] += 1
+
+    monkeypatch.setattr(token_blocklist, "execute_command", counting_execute_command)
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    yield counts
+    event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+
+@pytest.mark.parametrize("healthy", [True, False], ids=["subscribed", "unsubscribed"])
+@pytest.mark.parametrize("path", list(WARM_STATEMENTS))
+async def test_one_token_check_per_request(client, admin_headers, catalog, call_counts, monkeypatch, path, healthy):
+    monkeypatch.setattr(revocation_cache, "healthy", healthy)
+    response = await client.get(path, headers=admin_headers)  # warms the caches
+    assert response.status_code == 200
+
+    call_counts.update(blocklist_get=0, sql=0)
+    response = await client.get(path, headers=admin_headers)
+
+    assert response.status_code == 200
+    # Without the subscription the blocklist is read from Redis and the principal cache is bypassed
+    assert call_counts["blocklist_get"] == (0 if healthy else 1)
+    assert call_counts["sql"] == WARM_STATEMENTS[path] + (0 if healthy else 1)
@@ -0,0 +1,38 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.cart.schemas import MAX_QUANTITY
+from app.cart.services import CartServices
+
+pytestmark = pytest.mark.anyio
+
+cart_services = CartServices()
+
+
+async def test_add_past_max_quantity_rejected(client, admin_headers, catalog):
+    _, products = catalog
+    product_id = str(products[0].id)
+    response = await client.post("/cart/", json={"product_id": product_id, "quantity": MAX_QUANTITY}, headers=admin_headers)
+    assert response.status_code == 200
+
+    response = await client.post("/cart/", json={"product_id": product_id, "quantity": 1}, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "cart_quantity_exceeded"
+
+    cart = (await client.get("/cart/", headers=admin_headers)).json()
+    assert [item["quantity"] for item in cart["items"] if item["product_id"] == product_id] == [MAX_QUANTITY]
+    await client.delete(f"/cart/{product_id}", headers=admin_headers)
+
+
+async def test_restored_cart_capped_at_max_quantity(started_app):
+    user_id, product_id = str(uuid.uuid4()), uuid.uuid4()
+    await cart_services.add_item(user_id, product_id, MAX_QUANTITY - 1, Decimal("1.00"))
+    assert await cart_services.take_cart_for_checkout(user_id, uuid.uuid4()) is not None
+    await cart_services.add_item(user_id, product_id, 5, Decimal("1.00"))  # Added while checking out
+
+    await cart_services.restore_cart(user_id)
+
+    cart = await cart_services.get_cart(user_id)
+    assert [item.quantity for item in cart.items] == [MAX_QUANTITY]
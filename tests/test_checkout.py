@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+from datetime import date
+
+import pytest
+from sqlmodel import select
+
+from app.cart.schemas import CartItemModel
+from app.db.models import Category, Order, OrderItem, Product, User
+from app.db.session import AsyncSessionLocal
+from app.error.custom_exceptions import InsufficientStock
+from app.order.services import OrderServices
+
+pytestmark = pytest.mark.anyio
+
+order_services = OrderServices()
+
+
+@pytest.fixture
+async def scarce_product(started_app) -> tuple[User, Product]:
+    async with AsyncSessionLocal() as session:
+        tag = uuid.uuid4().hex[:8]
+        user = User(
+            email=f"buyer-{tag}@example.com",
+            username=f"buyer-{tag}",
+            last_name="buyer",
+            first_name="buyer",
+            hashed_password="",
+            role="user",
+            is_verified=True,
+        )
+        category = Category(name=f"scarce-{tag}")
+        session.add_all([user, category])
+        await session.commit()
+        product = Product(
+            sku=f"SCARCE-{tag}",
+            description="checkout contention",
+            price=10,
+            stock=20,
+            category_id=category.id,
+            created_at=date.today(),
+        )
+        session.add(product)
+        await session.commit()
+        return user, product
+
+
+async def test_concurrent_checkouts_do_not_oversell(scarce_product):
+    user, product = scarce_product
+
+    async def buy() -> bool:
+        async with AsyncSessionLocal() as session:
+            try:
+                await order_services.checkout(
+                    str(user.id), [CartItemModel(product_id=product.id, quantity=1, price_at_purchase=0)], session
+                )
+                return True
+            except InsufficientStock:
+                return False
+
+    results = await asyncio.gather(*(buy() for _ in range(60)))
+
+    async with AsyncSessionLocal() as session:
+        stock = (await session.exec(select(Product.stock).where(Product.id == product.id))).one()
+        orders = (await session.exec(select(Order.id).where(Order.user_id == user.id))).all()
+        ordered = (await session.exec(select(OrderItem.quantity).where(OrderItem.product_id == product.id))).all()
+    assert sum(results) == 20
+    assert len(orders) == 20
+    assert sum(ordered) == 20
+    assert stock == 0
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from fastapi_mail import ConnectionConfig
+
+from app import celery_tasks
+from app.mail import SMTPPool, create_message
+from tests.smtp_sink import SMTPSink
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def sink():
+    sink = SMTPSink()
+    await sink.start()
+    yield sink
+    await sink.stop()
+
+
+@pytest.fixture
+def sink_config(sink) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="",
+        MAIL_PASSWORD="",
+        MAIL_FROM="test@example.com",
+        MAIL_PORT=sink.port,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False,
+    )
+
+
+def message(i: int):
+    return create_message([f"user{i}@example.com"], "Test", "<p>hello</p>")
+
+
+async def test_messages_share_one_connection(sink, sink_config):
+    pool = SMTPPool(sink_config)
+    for i in range(25):
+        await pool.send(message(i))
+    await pool.close()
+
+    assert sink.messages == 25
+    assert sink.connections == 1
+    assert pool.stats()["sent"] == 25
+
+
+async def test_session_recycled_after_max_messages(sink, sink_config):
+    pool = SMTPPool(sink_config, max_messages=10)
+    for i in range(25):
+        await pool.send(message(i))
+    await pool.close()
+
+    assert sink.messages == 25
+    assert sink.connections == 3
+
+
+async def test_session_recycled_after_idle(sink, sink_config):
+    pool = SMTPPool(sink_config, idle_seconds=0.05)
+    await pool.send(message(0))
+    await pool.send(message(1))
+    await asyncio.sleep(0.1)
+    await pool.send(message(2))
+    await pool.close()
+
+    assert sink.messages == 3
+    assert sink.connections == 2
+
+
+async def test_dropped_connection_reconnected_once(sink, sink_config):
+    pool = SMTPPool(sink_config)
+    await pool.send(message(0))
+    sink.drop_next_mail = True
+    await pool.send(message(1))
+    await pool.close()
+
+    assert sink.messages == 2
+    assert sink.connections == 2
+    assert pool.stats()["failed"] == 0
+
+
+async def test_failing_message_does_not_stop_the_batch(sink, sink_config, monkeypatch):
+    sink.refused.add("user2@example.com")
+    pool = SMTPPool(sink_config)
+    monkeypatch.setattr(celery_tasks, "smtp_pool", pool)
+    monkeypatch.setattr(celery_tasks, "worker_loop", None)
+    emails = [
+        {"recipients": [f"user{i}@example.com"], "subject": "Test", "body": "<p>hello</p>"}
+        for i in range(5)
+    ]
+
+    def run_task():
+        # The task drives its own event loop, like in a worker process; the sink keeps serving on this one
+        try:
+            return celery_tasks.send_email_batch(emails)
+        finally:
+            celery_tasks.worker_loop.run_until_complete(pool.close())
+            celery_tasks.worker_loop.close()
+
+    report = await asyncio.to_thread(run_task)
+
+    assert report["sent"] == 4
+    assert report["failed"] == 1
+    assert sink.messages == 4
+    assert sink.connections == 1
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.auth import utils
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def release(monkeypatch):
+    """Event the jobs of these tests block on, set on teardown so a failing test does not hang"""
+    release = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(utils, "hash_executor", executor)
+    monkeypatch.setattr(utils, "pending_hash_jobs", 0)
+    yield release
+    release.set()
+    executor.shutdown(wait=True)
+
+
+async def test_cancelled_call_keeps_its_slot_until_the_job_is_done(release):
+    running = asyncio.create_task(utils.run_in_hash_executor(release.wait))
+    queued = asyncio.create_task(utils.run_in_hash_executor(release.wait))
+    await asyncio.sleep(0.05)
+
+    running.cancel()  # Client disconnects, the job keeps running on the executor
+    await asyncio.gather(running, return_exceptions=True)
+    assert utils.pending_hash_jobs == 2
+
+    queued.cancel()  # Never started, the executor drops it
+    await asyncio.gather(queued, return_exceptions=True)
+    assert utils.pending_hash_jobs == 1
+
+    release.set()
+    await asyncio.to_thread(utils.hash_executor.shutdown, wait=True)
+    assert utils.pending_hash_jobs == 0
+
+
+async def test_full_queue_fails_fast(release, monkeypatch):
+    monkeypatch.setattr(utils.Config, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(utils.Config, "PASSWORD_HASH_MAX_QUEUE", 0)
+    running = asyncio.create_task(utils.run_in_hash_executor(release.wait))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(utils.PasswordHashingBusy):
+        await utils.run_in_hash_executor(release.wait)
+
+    release.set()
+    assert await running is True
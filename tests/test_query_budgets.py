@@ -0,0 +1,46 @@
+"""
+SQL statements per request on the product and category read routes, with cold caches (the worst case).
+
+Every budget is one statement for the route plus the user lookup of `get_current_user`; a query per
+row (N+1) would also trip the repeated-statement check.
+"""
+import pytest
+
+from app.auth.services import principal_cache
+from app.category.services import category_cache
+from app.db.profiler import assert_query_budget
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+async def cold_caches():
+    principal_cache.clear()
+    await category_cache.invalidate()
+
+
+async def test_product_list_budget(profiled_client, admin_headers, catalog):
+    response = await profiled_client.get("/products/", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) >= len(catalog[1])
+    assert_query_budget(response, max_queries=2)
+
+
+async def test_product_item_budget(profiled_client, admin_headers, catalog):
+    _, products = catalog
+    response = await profiled_client.get(f"/products/{products[0].id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert_query_budget(response, max_queries=2)
+
+
+async def test_category_list_budget(profiled_client, admin_headers, catalog):
+    response = await profiled_client.get("/category/", headers=admin_headers)
+    assert response.status_code == 200
+    assert_query_budget(response, max_queries=2)
+
+
+async def test_category_item_budget(profiled_client, admin_headers, catalog):
+    category, _ = catalog
+    response = await profiled_client.get(f"/category/{category.id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert_query_budget(response, max_queries=2)
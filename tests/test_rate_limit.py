@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.auth import rate_limit
+from app.auth.rate_limit import LocalTokenBuckets, RateLimiter
+from app.db.redis import CircuitBreaker
+from app.error.custom_exceptions import RateLimitExceeded
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def script_calls(monkeypatch):
+    """Replace the Redis script with one that hangs, and give the limiter fresh buckets and breaker"""
+    calls = []
+
+    async def hung_script(keys, args):
+        calls.append(keys[0])
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(rate_limit, "TOKEN_BUCKET_SCRIPT", hung_script)
+    monkeypatch.setattr(rate_limit, "local_buckets", LocalTokenBuckets())
+    monkeypatch.setattr(rate_limit, "rate_limit_breaker", CircuitBreaker(failure_threshold=2, reset_timeout=30))
+    return calls
+
+
+async def test_shared_buckets_limit_across_limiters(started_app):
+    limiter = RateLimiter("test-shared", limit=2)
+    await limiter.check("alice")
+    await RateLimiter("test-shared", limit=2).check("alice")
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check("alice")
+
+
+async def test_hung_redis_falls_back_to_local_buckets(script_calls):
+    limiter = RateLimiter("test-hung", limit=3)
+    start = time.perf_counter()
+    for _ in range(3):
+        await limiter.check("alice")
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check("alice")
+
+    assert time.perf_counter() - start < 1
+    # The breaker opened after two timeouts, later checks no longer wait on Redis
+    assert len(script_calls) == 2
+
+
+async def test_redis_error_falls_back_to_local_buckets(monkeypatch, script_calls):
+    async def failing_script(keys, args):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(rate_limit, "TOKEN_BUCKET_SCRIPT", failing_script)
+    limiter = RateLimiter("test-down", limit=1)
+    await limiter.check("alice")
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check("alice")